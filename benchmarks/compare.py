@@ -0,0 +1,50 @@
+"""
+Compares two benchmark result files and exits non-zero on a regression.
+
+    python -m benchmarks.compare results.json baseline.json --tolerance 0.15
+"""
+import argparse
+import json
+import sys
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+
+    for name, base in baseline.get("operations", {}).items():
+        now = current.get("operations", {}).get(name)
+        if now is None:
+            continue
+        if base["p99_ms"] and now["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {base['p99_ms']}ms -> {now['p99_ms']}ms")
+        if base["throughput_rps"] and now["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput_rps']} -> {now['throughput_rps']} req/s")
+
+    for name, base in baseline.get("queries_per_request", {}).items():
+        now = current.get("queries_per_request", {}).get(name)
+        if now is not None and now > base:
+            regressions.append(f"{name}: queries per request {base} -> {now}")
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("current")
+    parser.add_argument("baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with open(args.current) as f:
+        current = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(current, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
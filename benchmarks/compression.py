@@ -0,0 +1,107 @@
+"""
+Bytes on the wire against latency for compressed catalog responses, without a server.
+
+For book listings of several sizes, encodes the JSON the list endpoint returns (and
+the NDJSON export, compressed chunk by chunk as the middleware streams it) with
+every encoding available in this environment, and reports compressed size, the CPU
+time spent compressing and decompressing, and the estimated time to deliver the
+body over a few link speeds (compress + transfer + decompress).
+
+    python -m benchmarks.compression --rows 1000 10000 50000
+"""
+import argparse
+import gzip
+import json
+import time
+import zlib
+
+import orjson
+
+from benchmarks.serialization import make_rows
+from src.compression import BrotliCompressor, GzipCompressor, ZstdCompressor, brotli, zstandard
+
+LINKS_MBIT = {"mobile_10mbit": 10, "broadband_100mbit": 100, "datacenter_1gbit": 1000}
+EXPORT_CHUNK_ROWS = 1000
+
+
+def encoders() -> dict[str, tuple]:
+    """name -> (compressor factory, decompress function)"""
+    options = {
+        "gzip-1": (lambda: GzipCompressor(1), gzip.decompress),
+        "gzip-6": (lambda: GzipCompressor(6), gzip.decompress),
+    }
+    if brotli is not None:
+        options["br-4"] = (lambda: BrotliCompressor(4), brotli.decompress)
+        options["br-9"] = (lambda: BrotliCompressor(9), brotli.decompress)
+    if zstandard is not None:
+        def zstd_decompress(data: bytes) -> bytes:
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        options["zstd-3"] = (lambda: ZstdCompressor(3), zstd_decompress)
+        options["zstd-9"] = (lambda: ZstdCompressor(9), zstd_decompress)
+    return options
+
+
+def measure(chunks: list[bytes], factory, decompress) -> dict:
+    started = time.perf_counter()
+    compressor = factory()
+    parts = [compressor.compress(chunk) for chunk in chunks[:-1]]
+    parts.append(compressor.finish(chunks[-1]))
+    compress_s = time.perf_counter() - started
+    body = b"".join(parts)
+
+    started = time.perf_counter()
+    restored = decompress(body)
+    decompress_s = time.perf_counter() - started
+    assert restored == b"".join(chunks)
+
+    return {"bytes": len(body), "compress_ms": compress_s * 1000, "decompress_ms": decompress_s * 1000}
+
+
+def deliveries(size: int, compress_ms: float = 0.0, decompress_ms: float = 0.0) -> dict[str, float]:
+    return {
+        link: round(compress_ms + size * 8 / (mbit * 1_000_000) * 1000 + decompress_ms, 2)
+        for link, mbit in LINKS_MBIT.items()
+    }
+
+
+def bodies(count: int) -> dict[str, list[bytes]]:
+    rows = [row._asdict() for row in make_rows(count)]
+    export = [
+        b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows[start:start + EXPORT_CHUNK_ROWS])
+        for start in range(0, len(rows), EXPORT_CHUNK_ROWS)
+    ]
+    return {"list_json": [orjson.dumps({"items": rows, "next_cursor": None})], "export_ndjson_streamed": export}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3, help="best of N timings per encoding")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.rows:
+        for shape, chunks in bodies(count).items():
+            size = sum(map(len, chunks))
+            entry = {
+                "rows": count,
+                "body": shape,
+                "identity": {"bytes": size, "delivery_ms": deliveries(size)},
+            }
+            for name, (factory, decompress) in encoders().items():
+                runs = [measure(chunks, factory, decompress) for _ in range(args.repeat)]
+                best = min(runs, key=lambda run: run["compress_ms"])
+                entry[name] = {
+                    "bytes": best["bytes"],
+                    "ratio": round(size / best["bytes"], 2),
+                    "compress_ms": round(best["compress_ms"], 2),
+                    "decompress_ms": round(best["decompress_ms"], 2),
+                    "delivery_ms": deliveries(best["bytes"], best["compress_ms"], best["decompress_ms"]),
+                }
+            results.append(entry)
+
+    print(json.dumps({"zlib": zlib.ZLIB_RUNTIME_VERSION, "links_mbit": LINKS_MBIT, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Latency of concurrent book reads during a credential-stuffing burst against /auth/login.
+
+Runs reads alone, then the same reads while attackers cycle through leaked emails
+with wrong passwords from a handful of source IPs (sent as X-Forwarded-For, so start
+the app with RATE_LIMIT_TRUST_FORWARDED=true). Run once with RATE_LIMIT_ENABLED=false
+and once with the defaults: with the limiter, most attempts should be turned away
+with 429 before reaching argon2 and read latency should stay near the baseline.
+
+    python -m benchmarks.credential_stuffing --base-url http://localhost:8000 \\
+        --email reader@example.com --password secret123
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+
+import httpx
+
+from benchmarks.login_storm import reader
+from benchmarks.stats import percentile
+
+
+async def attacker(
+    client: httpx.AsyncClient, attempts: itertools.cycle, deadline: float, outcomes: dict[int, int], retry_after: list[float]
+) -> None:
+    while time.perf_counter() < deadline:
+        email, ip = next(attempts)
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": email, "password": "not-the-password"},
+            headers={"X-Forwarded-For": ip},
+        )
+        outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+        if "retry-after" in response.headers:
+            retry_after.append(float(response.headers["retry-after"]))
+
+
+async def run_phase(args: argparse.Namespace, token: str, with_attack: bool) -> dict:
+    latencies: list[float] = []
+    outcomes: dict[int, int] = {}
+    retry_after: list[float] = []
+    limits = httpx.Limits(max_connections=args.readers + args.attackers)
+    attempts = itertools.cycle(
+        (f"victim{index}@example.com", f"203.0.113.{index % args.source_ips + 1}") for index in range(args.emails)
+    )
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + args.duration
+        tasks = [reader(client, token, deadline, latencies) for _ in range(args.readers)]
+        if with_attack:
+            tasks += [attacker(client, attempts, deadline, outcomes, retry_after) for _ in range(args.attackers)]
+        await asyncio.gather(*tasks)
+
+    attempted = sum(outcomes.values())
+    return {
+        "phase": "credential_stuffing" if with_attack else "baseline",
+        "reads": len(latencies),
+        "read_p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "read_p95_ms": round(percentile(latencies, 95), 2),
+        "read_p99_ms": round(percentile(latencies, 99), 2),
+        "login_attempts": attempted,
+        "login_status_counts": outcomes,
+        "rate_limited_share": round(outcomes.get(429, 0) / attempted, 3) if attempted else 0.0,
+        "median_retry_after_s": statistics.median(retry_after) if retry_after else None,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per phase")
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--attackers", type=int, default=64)
+    parser.add_argument("--emails", type=int, default=10000, help="distinct emails the attack cycles through")
+    parser.add_argument("--source-ips", type=int, default=8)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url) as client:
+        response = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+    results = [await run_phase(args, token, with_attack=False), await run_phase(args, token, with_attack=True)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+"""
+Fan-out latency of book change events to many SSE subscribers.
+
+For each subscriber count, opens that many /books/events streams against a running
+instance (a single uvicorn worker, so every stream shares one hub), half of them
+filtered to the benchmark book's language and half to a language no book has. It
+then renames the book repeatedly and measures, per delivered event, the time from
+sending the PATCH to the event arriving, which includes the write and its commit.
+
+    python -m benchmarks.event_fanout --base-url http://localhost:8000 \\
+        --email reader@example.com --password secret123 --subscribers 100 1000 5000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+from benchmarks.stats import percentile
+
+LANGUAGE = "fanout-bench"
+OTHER_LANGUAGE = "fanout-none"
+
+
+async def subscriber(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    language: str,
+    ready: asyncio.Event,
+    connected: list[int],
+    total: int,
+    sent: dict[int, float],
+    latencies: list[float],
+    closed: list[str],
+) -> None:
+    async with client.stream("GET", "/api/v1/books/events", params={"language": language}, headers=headers) as response:
+        response.raise_for_status()
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("retry:"):
+                connected.append(1)
+                if len(connected) == total:
+                    ready.set()
+            elif line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:") and event == "book":
+                title = json.loads(line[5:])["book"]["title"]
+                seq = int(title.rsplit("-", 1)[1])
+                latencies.append((time.perf_counter() - sent[seq]) * 1000)
+            elif line.startswith("data:") and event == "closed":
+                closed.append(json.loads(line[5:])["reason"])
+                return
+
+
+async def run(args: argparse.Namespace, headers: dict[str, str], book_id: str, count: int) -> dict:
+    limits = httpx.Limits(max_connections=count + 10, max_keepalive_connections=count + 10)
+    timeout = httpx.Timeout(60, read=None)
+    sent: dict[int, float] = {}
+    latencies: list[float] = []
+    closed: list[str] = []
+    connected: list[int] = []
+    ready = asyncio.Event()
+    matching = count // 2
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout) as client:
+        readers = [
+            asyncio.create_task(subscriber(
+                client, headers, LANGUAGE if index < matching else OTHER_LANGUAGE,
+                ready, connected, count, sent, latencies, closed,
+            ))
+            for index in range(count)
+        ]
+        await asyncio.wait_for(ready.wait(), timeout=120)
+
+        started = time.perf_counter()
+        for seq in range(args.events):
+            sent[seq] = time.perf_counter()
+            response = await client.patch(f"/api/v1/books/{book_id}", json={"title": f"fanout-{seq}"}, headers=headers)
+            response.raise_for_status()
+            await asyncio.sleep(1 / args.rate)
+        elapsed = time.perf_counter() - started
+
+        await asyncio.sleep(args.grace)
+        for task in readers:
+            task.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+    expected = matching * args.events
+    return {
+        "subscribers": count,
+        "matching_subscribers": matching,
+        "events": args.events,
+        "events_per_second": round(args.events / elapsed, 1),
+        "deliveries_expected": expected,
+        "deliveries": len(latencies),
+        "evicted": closed.count("slow_consumer"),
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50.0, help="book updates per second")
+    parser.add_argument("--grace", type=float, default=2.0, help="seconds to wait for stragglers after the last update")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url) as client:
+        response = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        response = await client.post("/api/v1/books", headers=headers, json={
+            "title": "fanout-start",
+            "author": "Benchmark",
+            "publisher": "Benchmark",
+            "published_date": "2020-01-01",
+            "page_count": 100,
+            "language": LANGUAGE,
+        })
+        response.raise_for_status()
+        book_id = response.json()["uid"]
+
+    try:
+        results = [await run(args, headers, book_id, count) for count in args.subscribers]
+    finally:
+        async with httpx.AsyncClient(base_url=args.base_url) as client:
+            await client.delete(f"/api/v1/books/{book_id}", headers=headers)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""
+Checks that every filter and sort of the books list endpoint is served by an index.
+
+Builds each query through `BookService.build_list_statement`, runs EXPLAIN on it and
+fails (exit code 1) when the plan doesn't scan the expected index. Point it at a
+throwaway, fully migrated database; `--seed` first fills `books` with synthetic rows.
+
+    python -m benchmarks.explain_filters --database-url postgresql+asyncpg://... --seed 1000000
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.books.schemas import BookFilter
+from src.books.service import BookService
+
+SEED_SQL = """
+INSERT INTO books (uid, title, author, publisher, published_date, page_count, language, created_at, updated_at)
+SELECT
+    gen_random_uuid(),
+    'Book ' || i,
+    'Author ' || (i % 5000),
+    'Publisher ' || (i % 500),
+    date '1950-01-01' + (i % 27000),
+    50 + (i % 1500),
+    (ARRAY['English', 'French', 'German', 'Spanish', 'Vietnamese'])[1 + i % 5],
+    now() - make_interval(secs => i),
+    now() - make_interval(secs => i)
+FROM generate_series(1, :rows) AS i
+"""
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+SCENARIOS = [
+    ("default order", BookFilter(), "ix_books_created_at_uid"),
+    ("author", BookFilter(author="Author 42"), "ix_books_author_created_at_uid"),
+    ("publisher", BookFilter(publisher="Publisher 7"), "ix_books_publisher_created_at_uid"),
+    ("language", BookFilter(language="French"), "ix_books_language_created_at_uid"),
+    (
+        "published range by date",
+        BookFilter(published_from=date(2001, 1, 1), published_to=date(2001, 12, 31), sort="published_date", order="asc"),
+        "ix_books_published_date_uid",
+    ),
+    ("page range by pages", BookFilter(min_pages=200, max_pages=210, sort="page_count"), "ix_books_page_count_uid"),
+    ("sorted by title", BookFilter(sort="title", order="asc"), "ix_books_title"),
+]
+
+
+def index_names(plan: dict) -> set[str]:
+    names = set()
+    if plan.get("Node Type") in INDEX_NODES:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic books first")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url)
+    service = BookService()
+    failures = 0
+
+    async with engine.begin() as conn:
+        if args.seed:
+            await conn.execute(text(SEED_SQL), {"rows": args.seed})
+            await conn.execute(text("ANALYZE books"))
+
+        for name, filters, expected in SCENARIOS:
+            statement = service.build_list_statement(["uid", "title"], limit=50, filters=filters)
+            sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            plan = result.scalar_one()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            used = index_names(plan[0]["Plan"])
+
+            ok = expected in used
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name}: expected {expected}, plan used {sorted(used) or 'no index'}")
+
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,138 @@
+"""
+Throwaway infrastructure for benchmark runs: Postgres/Redis containers and the app
+itself, started as a uvicorn subprocess configured through environment variables.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class DockerContainer:
+    def __init__(self, image: str, container_port: int, env: dict[str, str] | None = None) -> None:
+        self.image = image
+        self.container_port = container_port
+        self.env = env or {}
+        self.container_id: str | None = None
+        self.port: int | None = None
+
+    def start(self) -> int:
+        command = ["docker", "run", "-d", "--rm", "-p", f"127.0.0.1::{self.container_port}"]
+        for key, value in self.env.items():
+            command += ["-e", f"{key}={value}"]
+        self.container_id = subprocess.check_output([*command, self.image], text=True).strip()
+
+        mapping = subprocess.check_output(["docker", "port", self.container_id, str(self.container_port)], text=True)
+        self.port = int(mapping.splitlines()[0].rsplit(":", 1)[1])
+        return self.port
+
+    def stop(self) -> None:
+        if self.container_id:
+            subprocess.run(["docker", "stop", self.container_id], capture_output=True)
+            self.container_id = None
+
+
+async def wait_for_postgres(database_url: str, timeout: float = 60) -> None:
+    import asyncpg
+
+    dsn = database_url.replace("postgresql+asyncpg://", "postgresql://")
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = await asyncpg.connect(dsn)
+            await conn.close()
+            return
+        except (OSError, asyncpg.PostgresError):
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.5)
+
+
+async def wait_for_redis(host: str, port: int, timeout: float = 30) -> None:
+    from redis import asyncio as redis
+
+    client = redis.Redis(host=host, port=port)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                await client.ping()
+                return
+            except redis.ConnectionError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.25)
+    finally:
+        await client.aclose()
+
+
+def app_env(database_url: str, redis_host: str, redis_port: int, extra: dict[str, str] | None = None) -> dict[str, str]:
+    return {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "REDIS_HOST": redis_host,
+        "REDIS_PORT": str(redis_port),
+        **(extra or {}),
+    }
+
+
+def migrate(env: dict[str, str]) -> None:
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=ROOT, env=env, check=True)
+
+
+class AppProcess:
+    def __init__(self, env: dict[str, str], workers: int = 1) -> None:
+        self.env = env
+        self.workers = workers
+        self.port = free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.process: subprocess.Popen | None = None
+
+    async def start(self, timeout: float = 60, ready_path: str = "/openapi.json") -> None:
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--host", "127.0.0.1",
+                "--port", str(self.port),
+                "--workers", str(self.workers),
+                "--log-level", "warning",
+                "--no-access-log",
+            ],
+            cwd=ROOT,
+            env=self.env,
+        )
+
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            while True:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"App exited during startup with code {self.process.returncode}")
+                try:
+                    if (await client.get(ready_path)).status_code == 200:
+                        return
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise TimeoutError("App did not become ready in time")
+                await asyncio.sleep(0.25)
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
@@ -0,0 +1,79 @@
+"""
+Latency of concurrent book reads while the server is busy hashing passwords.
+
+Runs two phases against a running instance: reads alone, then the same reads while
+a storm of logins hammers argon2. Compare runs with PASSWORD_HASH_WORKERS=0 (hashing
+inline on the event loop) against the default pool to see the difference in p99.
+
+    python -m benchmarks.login_storm --base-url http://localhost:8000 \\
+        --email reader@example.com --password secret123
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+from benchmarks.stats import percentile
+
+
+async def reader(client: httpx.AsyncClient, token: str, deadline: float, latencies: list[float]) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/api/v1/books", params={"limit": 20}, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+
+async def login_storm(client: httpx.AsyncClient, email: str, password: str, deadline: float, outcomes: dict[int, int]) -> None:
+    while time.perf_counter() < deadline:
+        response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+        outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+
+
+async def run_phase(args: argparse.Namespace, token: str, with_storm: bool) -> dict:
+    latencies: list[float] = []
+    outcomes: dict[int, int] = {}
+    limits = httpx.Limits(max_connections=args.readers + args.logins)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + args.duration
+        tasks = [reader(client, token, deadline, latencies) for _ in range(args.readers)]
+        if with_storm:
+            tasks += [login_storm(client, args.email, args.password, deadline, outcomes) for _ in range(args.logins)]
+        await asyncio.gather(*tasks)
+
+    return {
+        "phase": "login_storm" if with_storm else "baseline",
+        "reads": len(latencies),
+        "read_p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+        "read_p95_ms": round(percentile(latencies, 95), 2),
+        "read_p99_ms": round(percentile(latencies, 99), 2),
+        "login_status_counts": outcomes,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per phase")
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=32)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url) as client:
+        response = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+    results = [await run_phase(args, token, with_storm=False), await run_phase(args, token, with_storm=True)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
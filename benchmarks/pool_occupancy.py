@@ -0,0 +1,129 @@
+"""
+Database pool occupancy under concurrent load, read from the app's pool metrics.
+
+Drives concurrent requests against a running instance (with a single uvicorn worker,
+so /metrics covers every request) and reports, per pool, how many checkouts each
+request caused, how long each connection was held, how long checkouts waited and
+how many connections were checked out at once. Run it before and after a change to
+session handling with the same arguments.
+
+    python -m benchmarks.pool_occupancy --base-url http://localhost:8000 \\
+        --email reader@example.com --password secret123 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.stats import summarize
+
+SAMPLE = re.compile(r'^(\w+)\{([^}]*)\} (\S+)$')
+
+ROUTES = {
+    "list_books": ("GET", "/api/v1/books", {"limit": 50}),
+    "me": ("GET", "/api/v1/auth/me", None),
+}
+
+
+def parse_metrics(text: str) -> dict[tuple[str, str], float]:
+    """(metric name, pool) -> value, for the db_pool_* series."""
+    values: dict[tuple[str, str], float] = defaultdict(float)
+    for line in text.splitlines():
+        match = SAMPLE.match(line)
+        if not match or not match.group(1).startswith("db_pool_"):
+            continue
+        name, labels, value = match.groups()
+        pool = re.search(r'pool="([^"]*)"', labels)
+        if pool and 'le="' not in labels:
+            values[(name, pool.group(1))] += float(value)
+    return values
+
+
+async def scrape(client: httpx.AsyncClient) -> dict[tuple[str, str], float]:
+    response = await client.get("/metrics")
+    response.raise_for_status()
+    return parse_metrics(response.text)
+
+
+async def sample_checked_out(client: httpx.AsyncClient, deadline: float, samples: dict[str, list[float]]) -> None:
+    while time.perf_counter() < deadline:
+        for (name, pool), value in (await scrape(client)).items():
+            if name == "db_pool_checked_out_connections":
+                samples[pool].append(value)
+        await asyncio.sleep(0.1)
+
+
+async def worker(
+    client: httpx.AsyncClient, route: str, token: str, deadline: float, latencies: list[float], errors: list[int]
+) -> None:
+    method, path, params = ROUTES[route]
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.request(method, path, params=params, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--route", choices=sorted(ROUTES), default="list_books")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        response = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        latencies: list[float] = []
+        errors: list[int] = []
+        occupancy: dict[str, list[float]] = defaultdict(list)
+
+        before = await scrape(client)
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            sample_checked_out(client, deadline, occupancy),
+            *(worker(client, args.route, token, deadline, latencies, errors) for _ in range(args.concurrency)),
+        )
+        elapsed = time.perf_counter() - started
+        after = await scrape(client)
+
+    def delta(name: str, pool: str) -> float:
+        return after.get((name, pool), 0.0) - before.get((name, pool), 0.0)
+
+    pools = {}
+    for pool in sorted({pool for _, pool in after}):
+        checkouts = delta("db_pool_hold_seconds_count", pool)
+        waits = delta("db_pool_wait_seconds_count", pool)
+        samples = occupancy.get(pool, [])
+        pools[pool] = {
+            "checkouts_per_request": round(checkouts / len(latencies), 3) if latencies else 0.0,
+            "mean_hold_ms": round(delta("db_pool_hold_seconds_sum", pool) / checkouts * 1000, 3) if checkouts else 0.0,
+            "mean_wait_ms": round(delta("db_pool_wait_seconds_sum", pool) / waits * 1000, 3) if waits else 0.0,
+            "timeouts": delta("db_pool_timeouts_total", pool),
+            "mean_checked_out": round(sum(samples) / len(samples), 2) if samples else 0.0,
+            "peak_checked_out": max(samples, default=0.0),
+        }
+
+    print(json.dumps({
+        "route": args.route,
+        "concurrency": args.concurrency,
+        "requests": summarize(latencies, len(errors), elapsed),
+        "pools": pools,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
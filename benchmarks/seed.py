@@ -0,0 +1,80 @@
+"""
+Synthetic catalog and user generators, scaled up from `src/books/book_data.py`.
+"""
+import random
+import uuid
+from datetime import date, timedelta
+from typing import Iterator
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.auth.hashing import password_hash
+from src.auth.models import User
+from src.books.book_data import books as BOOK_TEMPLATES
+from src.books.models import Book
+
+LANGUAGES = ["English", "French", "German", "Spanish", "Vietnamese"]
+BATCH_SIZE = 5000
+
+
+def _template_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return date(2000, 1, 1)
+
+
+def generate_books(count: int, seed: int = 0) -> Iterator[dict]:
+    """`BookCreate`-shaped rows cycling through the sample data with varied fields."""
+    rng = random.Random(seed)
+    for i in range(count):
+        template = BOOK_TEMPLATES[i % len(BOOK_TEMPLATES)]
+        yield {
+            "title": f"{template['title']} vol. {i // len(BOOK_TEMPLATES) + 1}",
+            "author": f"{template['author']} {rng.randrange(2000)}",
+            "publisher": f"{template['publisher']} {rng.randrange(200)}",
+            "published_date": _template_date(template["published_date"]) - timedelta(days=rng.randrange(20000)),
+            "page_count": rng.randrange(40, template["page_count"] + 41),
+            "language": rng.choice(LANGUAGES),
+        }
+
+
+def generate_users(count: int, password: str) -> Iterator[dict]:
+    """
+    Rows for `user_accounts`. Every user shares one password so argon2 runs once
+    instead of per user; the first user is an admin.
+    """
+    hashed = password_hash().hash(password)
+    for i in range(count):
+        yield {
+            "uid": uuid.uuid4(),
+            "username": f"bench_user_{i}",
+            "email": f"bench_user_{i}@example.com",
+            "first_name": "Bench",
+            "last_name": f"User {i}",
+            "role": "admin" if i == 0 else "user",
+            "is_verified": True,
+            "password_hash": hashed,
+        }
+
+
+async def seed_database(database_url: str, book_count: int, user_count: int, password: str) -> list[str]:
+    """Insert the generated rows in batches; returns the seeded users' emails."""
+    engine = create_async_engine(database_url)
+    users = list(generate_users(user_count, password))
+
+    async with engine.begin() as conn:
+        await conn.execute(insert(User.__table__), users)
+
+        batch = []
+        for book in generate_books(book_count):
+            batch.append(book)
+            if len(batch) == BATCH_SIZE:
+                await conn.execute(insert(Book.__table__), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(Book.__table__), batch)
+
+    await engine.dispose()
+    return [user["email"] for user in users]
@@ -0,0 +1,92 @@
+"""
+CPU cost of serializing a large book list, without a database.
+
+Times three ways of turning the same rows into a JSON response body:
+
+    response_model   ORM `Book` objects re-validated through `response_model=list[BookRead]`
+                     and encoded by FastAPI's default JSONResponse (the previous path)
+    orjson_rows      row tuples turned into dicts and written by ORJSONResponse (list/search)
+    type_adapter     rows validated once by a `TypeAdapter(list[BookRead])` and dumped by
+                     pydantic-core (bulk endpoints)
+
+    python -m benchmarks.serialization --rows 10000 --repeat 20
+"""
+import argparse
+import json
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.testclient import TestClient
+
+from benchmarks.seed import generate_books
+from benchmarks.stats import summarize
+from src.books.models import Book
+from src.books.schemas import BookPage, BookRead
+from src.books.serialization import book_list_adapter, page_response
+from src.books.service import BOOK_FIELDS
+
+BookRow = namedtuple("BookRow", BOOK_FIELDS)
+
+
+def make_rows(count: int) -> list[BookRow]:
+    created = datetime(2024, 1, 1)
+    rows = []
+    for i, book in enumerate(generate_books(count, seed=0)):
+        stamp = created + timedelta(seconds=i)
+        rows.append(BookRow(**{**book, "uid": uuid.uuid4(), "created_at": stamp, "updated_at": stamp}))
+    return rows
+
+
+def build_app(rows: list[BookRow]) -> FastAPI:
+    books = [Book(**row._asdict()) for row in rows]
+    app = FastAPI()
+
+    @app.get("/response_model", response_model=list[BookRead])
+    async def response_model():
+        return books
+
+    @app.get("/orjson_rows", response_class=ORJSONResponse)
+    async def orjson_rows():
+        items = [{name: getattr(row, name) for name in BOOK_FIELDS} for row in rows]
+        return page_response(BookPage.model_construct(items=items, next_cursor=None))
+
+    @app.get("/type_adapter")
+    async def type_adapter():
+        validated = book_list_adapter.validate_python(books, from_attributes=True)
+        return Response(book_list_adapter.dump_json(validated), media_type="application/json")
+
+    return app
+
+
+def measure(client: TestClient, path: str, repeat: int) -> dict:
+    client.get(path).raise_for_status()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(path).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return summarize(latencies, 0, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    with TestClient(build_app(rows)) as client:
+        results = {
+            path: measure(client, f"/{path}", args.repeat)
+            for path in ("response_model", "orjson_rows", "type_adapter")
+        }
+    print(json.dumps({"rows": args.rows, "repeat": args.repeat, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
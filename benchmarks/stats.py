@@ -0,0 +1,20 @@
+import statistics
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(latencies_ms: list[float], errors: int, duration: float) -> dict:
+    return {
+        "count": len(latencies_ms),
+        "errors": errors,
+        "throughput_rps": round(len(latencies_ms) / duration, 2) if duration else 0.0,
+        "p50_ms": round(statistics.median(latencies_ms), 2) if latencies_ms else 0.0,
+        "p95_ms": round(percentile(latencies_ms, 95), 2),
+        "p99_ms": round(percentile(latencies_ms, 99), 2),
+    }
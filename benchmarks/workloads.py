@@ -0,0 +1,156 @@
+"""
+Request mixes driven against a running app, one coroutine per route exercised.
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.seed import generate_books
+from benchmarks.stats import summarize
+
+API = "/api/v1"
+SEARCH_TERMS = ["python", "django", "web socket", "html5", "pyhton", "freeman", "oreilly", "packt"]
+
+
+@dataclass
+class WorkloadContext:
+    client: httpx.AsyncClient
+    tokens: list[str]
+    emails: list[str]
+    password: str
+    book_ids: list[str]
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+
+    def auth(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+
+async def list_books(ctx: WorkloadContext) -> httpx.Response:
+    return await ctx.client.get(f"{API}/books", params={"limit": 50}, headers=ctx.auth())
+
+
+async def filter_books(ctx: WorkloadContext) -> httpx.Response:
+    params = {"limit": 50, "language": "French", "sort": "published_date"}
+    return await ctx.client.get(f"{API}/books", params=params, headers=ctx.auth())
+
+
+async def get_book(ctx: WorkloadContext) -> httpx.Response:
+    return await ctx.client.get(f"{API}/books/{ctx.rng.choice(ctx.book_ids)}", headers=ctx.auth())
+
+
+async def search_books(ctx: WorkloadContext) -> httpx.Response:
+    params = {"q": ctx.rng.choice(SEARCH_TERMS), "limit": 20}
+    return await ctx.client.get(f"{API}/books/search", params=params, headers=ctx.auth())
+
+
+async def create_book(ctx: WorkloadContext) -> httpx.Response:
+    book = next(generate_books(1, seed=ctx.rng.randrange(1 << 30)))
+    book["published_date"] = book["published_date"].isoformat()
+    response = await ctx.client.post(f"{API}/books", json=book, headers=ctx.auth())
+    if response.status_code == 201:
+        ctx.book_ids.append(response.json()["uid"])
+    return response
+
+
+async def update_book(ctx: WorkloadContext) -> httpx.Response:
+    patch = {"page_count": ctx.rng.randrange(40, 2000)}
+    return await ctx.client.patch(f"{API}/books/{ctx.rng.choice(ctx.book_ids)}", json=patch, headers=ctx.auth())
+
+
+async def login(ctx: WorkloadContext) -> httpx.Response:
+    credentials = {"email": ctx.rng.choice(ctx.emails), "password": ctx.password}
+    return await ctx.client.post(f"{API}/auth/login", json=credentials)
+
+
+async def me(ctx: WorkloadContext) -> httpx.Response:
+    return await ctx.client.get(f"{API}/auth/me", headers={"Authorization": f"Bearer {ctx.tokens[0]}"})
+
+
+OPERATIONS: dict[str, Callable[[WorkloadContext], Awaitable[httpx.Response]]] = {
+    "list_books": list_books,
+    "filter_books": filter_books,
+    "get_book": get_book,
+    "search_books": search_books,
+    "create_book": create_book,
+    "update_book": update_book,
+    "login": login,
+    "me": me,
+}
+
+DEFAULT_MIX = {
+    "list_books": 30,
+    "filter_books": 10,
+    "get_book": 25,
+    "search_books": 10,
+    "create_book": 8,
+    "update_book": 5,
+    "login": 10,
+    "me": 2,
+}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, weight = part.split("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}")
+        mix[name] = int(weight)
+    return mix
+
+
+async def run_mixed(ctx: WorkloadContext, mix: dict[str, int], concurrency: int, duration: float) -> dict[str, dict]:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, int] = {name: 0 for name in names}
+
+    async def worker(deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            name = ctx.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await OPERATIONS[name](ctx)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append((time.perf_counter() - start) * 1000)
+            errors[name] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(started + duration) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    results = {name: summarize(latencies[name], errors[name], elapsed) for name in names}
+    every = [sample for samples in latencies.values() for sample in samples]
+    results["total"] = summarize(every, sum(errors.values()), elapsed)
+    return results
+
+
+async def statement_count(client: httpx.AsyncClient) -> float:
+    response = await client.get("/metrics")
+    return sum(
+        float(line.rsplit(" ", 1)[1])
+        for line in response.text.splitlines()
+        if line.startswith("db_statements_total{")
+    )
+
+
+async def calibrate_queries(ctx: WorkloadContext, names: list[str], samples: int) -> dict[str, float]:
+    """
+    SQL statements per request for each operation, from the app's statement counter.
+    Requests run one at a time so nothing else moves the counter; accurate with a
+    single app worker.
+    """
+    per_request = {}
+    for name in names:
+        before = await statement_count(ctx.client)
+        for _ in range(samples):
+            await OPERATIONS[name](ctx)
+        after = await statement_count(ctx.client)
+        per_request[name] = round((after - before) / samples, 2)
+    return per_request
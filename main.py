@@ -2,10 +2,13 @@ from fastapi import FastAPI
 from src.books.routes import book_router
 from src.auth.routes import auth_router
 from src.lifespan import lifespan
-
-app = FastAPI()
-
-app.include_router(book_router, prefix=f"/books")
+from src.metrics import metrics_router
+from src.config import Config
+from src.db.database import engine
+from src.db.replicas import read_router, ReadYourWritesMiddleware
+from src.db.redis import redis_client, cache_client
+from src.instrumentation import InstrumentationMiddleware, instrument_sql, instrument_redis
+from src.compression import CompressionMiddleware
 
 version = "v1"
 
@@ -27,3 +30,31 @@ app.include_router(
     prefix=f"/api/{version}/auth",
     tags=["auth"]
 )
+
+app.include_router(metrics_router)
+
+if read_router.replicas:
+    app.add_middleware(ReadYourWritesMiddleware, window=Config.DB_READ_YOUR_WRITES_WINDOW)
+
+if Config.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=Config.COMPRESSION_MINIMUM_SIZE,
+        cpu_budget=Config.COMPRESSION_CPU_BUDGET,
+        gzip_level=Config.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=Config.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=Config.COMPRESSION_ZSTD_LEVEL,
+    )
+
+if Config.INSTRUMENTATION_ENABLED:
+    instrument_sql(engine)
+    for replica in read_router.replicas:
+        instrument_sql(replica.engine)
+    instrument_redis(redis_client)
+    instrument_redis(cache_client)
+    app.add_middleware(
+        InstrumentationMiddleware,
+        profile_token=Config.PROFILING_TOKEN,
+        sample_rate=Config.PROFILING_SAMPLE_RATE,
+        profile_dir=Config.PROFILING_DIR,
+    )
@@ -0,0 +1,29 @@
+"""add books updated_at index
+
+Revision ID: 3e8d5c0b7a19
+Revises: f61e0b3848e5
+Create Date: 2026-02-03 14:21:07.415902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8d5c0b7a19'
+down_revision: Union[str, Sequence[str], None] = 'f61e0b3848e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_books_updated_at', 'books', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_updated_at', table_name='books')
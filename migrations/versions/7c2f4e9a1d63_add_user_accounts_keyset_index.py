@@ -0,0 +1,29 @@
+"""add user accounts keyset index
+
+Revision ID: 7c2f4e9a1d63
+Revises: 3e8d5c0b7a19
+Create Date: 2026-02-10 11:48:26.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2f4e9a1d63'
+down_revision: Union[str, Sequence[str], None] = '3e8d5c0b7a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_user_accounts_created_at_uid', 'user_accounts', ['created_at', 'uid'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_accounts_created_at_uid', table_name='user_accounts')
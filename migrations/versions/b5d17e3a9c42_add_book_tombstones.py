@@ -0,0 +1,40 @@
+"""add book tombstones and change feed index
+
+Revision ID: b5d17e3a9c42
+Revises: 7c2f4e9a1d63
+Create Date: 2026-02-17 15:06:41.528390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d17e3a9c42'
+down_revision: Union[str, Sequence[str], None] = '7c2f4e9a1d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('book_tombstones',
+    sa.Column('uid', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('deleted_at', postgresql.TIMESTAMP(), nullable=False),
+    sa.PrimaryKeyConstraint('uid')
+    )
+    op.create_index('ix_book_tombstones_deleted_at_uid', 'book_tombstones', ['deleted_at', 'uid'], unique=False)
+    # Widened so the change feed's (updated_at, uid) keyset is a single index range
+    op.create_index('ix_books_updated_at_uid', 'books', ['updated_at', 'uid'], unique=False)
+    op.drop_index('ix_books_updated_at', table_name='books')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_books_updated_at', 'books', ['updated_at'], unique=False)
+    op.drop_index('ix_books_updated_at_uid', table_name='books')
+    op.drop_index('ix_book_tombstones_deleted_at_uid', table_name='book_tombstones')
+    op.drop_table('book_tombstones')
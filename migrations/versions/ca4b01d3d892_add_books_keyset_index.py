@@ -0,0 +1,46 @@
+"""add books keyset index
+
+Revision ID: ca4b01d3d892
+Revises: 51b0bdaa8422
+Create Date: 2026-01-06 10:12:41.208531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ca4b01d3d892'
+down_revision: Union[str, Sequence[str], None] = '51b0bdaa8422'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The books table has so far only been created by init_db's create_all,
+    # so make sure it exists before indexing it on a freshly migrated database.
+    if not sa.inspect(op.get_bind()).has_table('books'):
+        op.create_table('books',
+        sa.Column('uid', sa.UUID(), nullable=False),
+        sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('author', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('publisher', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('published_date', sa.Date(), nullable=False),
+        sa.Column('page_count', sa.Integer(), nullable=False),
+        sa.Column('language', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('uid')
+        )
+        op.create_index(op.f('ix_books_title'), 'books', ['title'], unique=False)
+
+    op.create_index('ix_books_created_at_uid', 'books', ['created_at', 'uid'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_created_at_uid', table_name='books')
@@ -0,0 +1,37 @@
+"""add books filter indexes
+
+Revision ID: f61e0b3848e5
+Revises: a0575888b6c0
+Create Date: 2026-01-27 09:03:52.871406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f61e0b3848e5'
+down_revision: Union[str, Sequence[str], None] = 'a0575888b6c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_books_author_created_at_uid', 'books', ['author', 'created_at', 'uid'], unique=False)
+    op.create_index('ix_books_publisher_created_at_uid', 'books', ['publisher', 'created_at', 'uid'], unique=False)
+    op.create_index('ix_books_language_created_at_uid', 'books', ['language', 'created_at', 'uid'], unique=False)
+    op.create_index('ix_books_published_date_uid', 'books', ['published_date', 'uid'], unique=False)
+    op.create_index('ix_books_page_count_uid', 'books', ['page_count', 'uid'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_books_page_count_uid', table_name='books')
+    op.drop_index('ix_books_published_date_uid', table_name='books')
+    op.drop_index('ix_books_language_created_at_uid', table_name='books')
+    op.drop_index('ix_books_publisher_created_at_uid', table_name='books')
+    op.drop_index('ix_books_author_created_at_uid', table_name='books')
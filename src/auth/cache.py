@@ -0,0 +1,130 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from src.auth.schemas import CurrentUser
+from src.config import Config
+from src.db.redis import redis_client, cache_client, publish_auth_event
+
+USER_KEY = "auth:user:{}"
+USER_PAGE_KEY = "auth:users:page:{}:{}"
+
+
+class UserCache:
+    """
+    Bounded LRU of authenticated users with a per-entry TTL.
+
+    With `shared` enabled, entries are also written to Redis so a user looked up by one
+    worker is a hit for the others. Invalidation drops both copies and is broadcast on
+    the auth events channel so other workers drop their local copies too.
+    """
+
+    def __init__(self, max_size: int, ttl: int, shared: bool = False) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = shared
+        self._entries: OrderedDict[str, tuple[float, CurrentUser]] = OrderedDict()
+
+    async def get_or_load(
+        self, user_id: str, loader: Callable[[], Awaitable[CurrentUser | None]]
+    ) -> CurrentUser | None:
+        user = self._get_local(user_id)
+        if user is not None:
+            return user
+
+        if self.shared:
+            user = await self._get_shared(user_id)
+            if user is not None:
+                self._put_local(user_id, user)
+                return user
+
+        user = await loader()
+        if user is not None:
+            await self.put(user_id, user)
+        return user
+
+    async def put(self, user_id: str, user: CurrentUser) -> None:
+        self._put_local(user_id, user)
+        if self.shared:
+            try:
+                await redis_client.set(USER_KEY.format(user_id), user.model_dump_json(), ex=self.ttl)
+            except RedisError:
+                pass
+
+    async def invalidate(self, user_id: str) -> None:
+        self.discard(user_id)
+        try:
+            if self.shared:
+                await redis_client.delete(USER_KEY.format(user_id))
+            await publish_auth_event("user", user_id)
+        except RedisError:
+            pass
+
+    def discard(self, user_id: str) -> None:
+        self._entries.pop(user_id, None)
+
+    def _get_local(self, user_id: str) -> CurrentUser | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return user
+
+    def _put_local(self, user_id: str, user: CurrentUser) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _get_shared(self, user_id: str) -> CurrentUser | None:
+        try:
+            payload = await redis_client.get(USER_KEY.format(user_id))
+        except RedisError:
+            return None
+        return CurrentUser.model_validate_json(payload) if payload else None
+
+
+class UserPageCache:
+    """
+    Serialized pages of the user listing, kept for a short TTL and never invalidated:
+    a signup shows up in the listing once the pages cached before it expire.
+    """
+
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+
+    async def get_or_load(self, limit: int, cursor: str | None, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        if not self.ttl:
+            return await loader()
+
+        key = USER_PAGE_KEY.format(limit, cursor or "")
+        try:
+            cached = await cache_client.get(key)
+        except RedisError:
+            cached = None
+        if cached is not None:
+            return cached
+
+        payload = await loader()
+        try:
+            await cache_client.set(key, payload, ex=self.ttl)
+        except RedisError:
+            pass
+        return payload
+
+
+user_cache = UserCache(
+    max_size=Config.USER_CACHE_MAX_SIZE,
+    ttl=Config.USER_CACHE_TTL,
+    shared=Config.USER_CACHE_SHARED,
+)
+
+user_page_cache = UserPageCache(ttl=Config.USER_PAGE_CACHE_TTL)
@@ -2,15 +2,24 @@ from typing import Dict, Any
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from src.auth.utils import decode_token
-from src.db.redis import token_in_blocklist
+from src.db.redis import token_revoked
 from src.auth.models import User
 from typing import List, Any
-from src.db.database import get_session
-from sqlmodel.ext.asyncio.session import AsyncSession
+from src.db.database import WriteSession
 from src.auth.service import UserService
+from src.auth.schemas import CurrentUser
+from src.auth.cache import user_cache
+from src.auth.token_cache import verified_tokens
+from src.auth.revocation import auth_events
+from src.config import Config
+from src.instrumentation import span
 
 class TokenBearer(HTTPBearer):
     async def __call__(self, request: Request) -> Dict[str, Any]:
+        with span("auth_token"):
+            return await self._authenticate(request)
+
+    async def _authenticate(self, request: Request) -> Dict[str, Any]:
         creds: HTTPAuthorizationCredentials = await super().__call__(request)
 
         if not creds or not creds.credentials:
@@ -19,22 +28,39 @@ class TokenBearer(HTTPBearer):
                 detail={"error": "Authorization token is missing"},
             )
 
-        try:
-            token_data = decode_token(creds.credentials)
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail={"error": "Invalid or expired token"},
-            )
-
-        jti = token_data.get("jti")
-        if not jti:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={"error": "Token is missing JTI claim"},
-            )
-
-        if await token_in_blocklist(jti):
+        return await self.verify(creds.credentials)
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Checks a raw token wherever it came from; for transports without an Authorization header."""
+        # A hit was already verified by this worker; only revocation can have changed since
+        cached = verified_tokens.get(token)
+        token_data = cached
+
+        if token_data is None:
+            try:
+                token_data = decode_token(token)
+            except Exception:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail={"error": "Invalid or expired token"},
+                )
+
+            jti = token_data.get("jti")
+            if not jti:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={"error": "Token is missing JTI claim"},
+                )
+
+        # With the local mirror live, revocation costs no Redis round trip, even for new tokens
+        if auth_events.ready:
+            revoked = auth_events.is_revoked(token_data)
+        else:
+            revoked = await token_revoked(token_data["jti"], token_data["sub"], token_data.get("iat", 0))
+        if cached is None and not revoked:
+            verified_tokens.put(token, token_data)
+
+        if revoked:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail={
@@ -67,19 +93,41 @@ class AccessTokenBearer(TypedTokenBearer):
 class RefreshTokenBearer(TypedTokenBearer):
     required_type = "refresh"
 
-async def get_current_user(token_details: dict = Depends(AccessTokenBearer()), session: AsyncSession = Depends(get_session),):
+# Shared instance so FastAPI resolves the token once per request for every dependency using it
+access_token_bearer = AccessTokenBearer()
+
+async def get_current_user(token_details: dict = Depends(access_token_bearer)) -> CurrentUser:
     user_id = token_details["sub"]
-    user = await UserService().get_user_by_id(user_id, session)
-    user_email = user.email
+
+    # Misses load from the primary: a lagging replica could return the role a change just
+    # invalidated, and it would then be cached, and authorize, for USER_CACHE_TTL
+    async def load_user() -> CurrentUser | None:
+        async with WriteSession() as session:
+            user = await UserService().get_user_by_id(user_id, session)
+        return CurrentUser.model_validate(user, from_attributes=True) if user else None
+
+    with span("auth_user"):
+        user = await user_cache.get_or_load(user_id, load_user)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"error": "User no longer exists"},
+        )
 
     return user
 
 class RoleChecker:
-    def __init__(self, allowed_roles: list[str]) -> None:
+    def __init__(self, allowed_roles: list[str], from_token: bool | None = None) -> None:
         self.allowed_roles = allowed_roles
+        self.from_token = Config.AUTH_ROLE_FROM_TOKEN if from_token is None else from_token
+
+    async def __call__(self, token_details: dict = Depends(access_token_bearer)) -> Any:
+        if self.from_token:
+            role = token_details.get("role")
+        else:
+            role = (await get_current_user(token_details)).role
 
-    def __call__(self, current_user: User = Depends(get_current_user)) -> Any:
-        if current_user.role in self.allowed_roles:
+        if role in self.allowed_roles:
             return True
 
         raise HTTPException(
@@ -0,0 +1,80 @@
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+
+from src.instrumentation import span
+
+
+@functools.cache
+def password_hash():
+    # Deferred so importing the app doesn't load argon2 until the first hash
+    from pwdlib import PasswordHash
+
+    return PasswordHash.recommended()
+
+
+# Module-level so they can be pickled into a process pool
+def _hash(password: str) -> str:
+    return password_hash().hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return password_hash().verify_and_update(password, hashed_password)
+
+
+class PasswordHasherPool:
+    """
+    Runs argon2 off the event loop on a thread or process pool.
+
+    At most `workers + max_queue` hashes may be pending; beyond that callers get a
+    fast 503 instead of queueing behind a login storm. `workers=0` hashes inline on
+    the event loop, which is only meant for comparison benchmarks.
+    """
+
+    def __init__(self, kind: str, workers: int, max_queue: int) -> None:
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pending = 0
+        self._executor: Executor | None = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        return await self._submit(_verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers == 0:
+            with span("password_hash"):
+                return fn(*args)
+
+        if self._pending >= self.workers + self.max_queue:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        try:
+            with span("password_hash"):
+                return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import Index
 import sqlalchemy.dialects.postgresql as pg
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -7,6 +8,10 @@ import uuid
 
 class User(SQLModel, table=True):
     __tablename__ = "user_accounts"
+    __table_args__ = (
+        # Keyset pagination of the user listing: ORDER BY created_at DESC, uid DESC
+        Index("ix_user_accounts_created_at_uid", "created_at", "uid"),
+    )
 
     uid: uuid.UUID = Field(
         sa_column=Column(
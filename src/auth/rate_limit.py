@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from src.config import Config
+from src.db.redis import take_tokens
+from src.metrics import AUTH_RATE_LIMITED
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY = "ratelimit:{}:{}:{}"
+
+
+class RateLimiter:
+    """
+    Token-bucket limits for one endpoint, per client IP, per email and per user,
+    taken atomically in Redis so they hold across workers.
+
+    A client Redis turns away is remembered in-process until its bucket refills, so
+    retrying in a tight loop is rejected without a round trip. When Redis is down the
+    limiter lets requests through; the password hasher's queue bound still sheds load.
+    """
+
+    def __init__(
+        self,
+        scope: str,
+        limits: dict[str, tuple[int, float]],
+        trust_forwarded: bool = False,
+        deny_cache_size: int = 10000,
+    ) -> None:
+        self.scope = scope
+        # Dimension ("ip", "email" or "user") -> (burst, sustained requests per minute)
+        self.limits = limits
+        self.trust_forwarded = trust_forwarded
+        self.deny_cache_size = deny_cache_size
+        self._denied: OrderedDict[str, float] = OrderedDict()
+
+    async def check(self, request: Request, email: str | None = None, user_id: str | None = None) -> None:
+        if not Config.RATE_LIMIT_ENABLED:
+            return
+
+        values = {"ip": self._client_ip(request), "email": email and email.strip().lower(), "user": user_id}
+        buckets = {
+            RATE_LIMIT_KEY.format(self.scope, dimension, self._digest(values[dimension])): (burst, per_minute / 60)
+            for dimension, (burst, per_minute) in self.limits.items()
+            if values[dimension]
+        }
+        if not buckets:
+            return
+
+        wait = self._locally_denied(buckets)
+        if wait:
+            AUTH_RATE_LIMITED.labels(self.scope, "local").inc()
+            self._reject(wait)
+
+        try:
+            allowed, waits = await take_tokens(buckets)
+        except RedisError:
+            logger.warning("Rate limiter unavailable, letting %s request through", self.scope)
+            return
+        if allowed:
+            return
+
+        until = time.monotonic()
+        for key, key_wait in zip(buckets, waits):
+            if key_wait:
+                self._denied[key] = until + key_wait
+                self._denied.move_to_end(key)
+        while len(self._denied) > self.deny_cache_size:
+            self._denied.popitem(last=False)
+
+        AUTH_RATE_LIMITED.labels(self.scope, "redis").inc()
+        self._reject(max(waits))
+
+    def _locally_denied(self, buckets: dict[str, tuple[int, float]]) -> float:
+        now = time.monotonic()
+        wait = 0.0
+        for key in buckets:
+            until = self._denied.get(key)
+            if until is None:
+                continue
+            if until <= now:
+                del self._denied[key]
+            else:
+                wait = max(wait, until - now)
+        return wait
+
+    def _client_ip(self, request: Request) -> str | None:
+        if self.trust_forwarded:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else None
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        # Keeps emails out of Redis key names
+        return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def _reject(wait: float) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+
+login_limiter = RateLimiter(
+    "login",
+    {"ip": Config.RATE_LIMIT_LOGIN_PER_IP, "email": Config.RATE_LIMIT_LOGIN_PER_EMAIL},
+    trust_forwarded=Config.RATE_LIMIT_TRUST_FORWARDED,
+    deny_cache_size=Config.RATE_LIMIT_DENY_CACHE_SIZE,
+)
+signup_limiter = RateLimiter(
+    "signup",
+    {"ip": Config.RATE_LIMIT_SIGNUP_PER_IP},
+    trust_forwarded=Config.RATE_LIMIT_TRUST_FORWARDED,
+    deny_cache_size=Config.RATE_LIMIT_DENY_CACHE_SIZE,
+)
+refresh_limiter = RateLimiter(
+    "refresh",
+    {"ip": Config.RATE_LIMIT_REFRESH_PER_IP, "user": Config.RATE_LIMIT_REFRESH_PER_USER},
+    trust_forwarded=Config.RATE_LIMIT_TRUST_FORWARDED,
+    deny_cache_size=Config.RATE_LIMIT_DENY_CACHE_SIZE,
+)
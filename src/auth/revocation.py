@@ -0,0 +1,110 @@
+import asyncio
+import json
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from src.auth.cache import user_cache
+from src.auth.token_cache import verified_tokens
+from src.auth.utils import REFRESH_TOKEN_EXPIRY
+from src.db.redis import redis_client, load_revocations, AUTH_EVENTS_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_DELAY = 1.0
+
+
+class AuthEventListener:
+    """
+    Keeps this worker's auth caches coherent with the rest of the fleet.
+
+    Subscribes to the auth events channel and mirrors revoked JTIs and per-user
+    not-before times locally, loading what was revoked before it subscribed, so any
+    token can be checked for revocation without a Redis round trip. The mirror is
+    only trusted while the subscription is live (`ready`); callers fall back to
+    querying Redis otherwise.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self._revoked: dict[str, float] = {}
+        self._not_before: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def is_revoked(self, token_data: dict) -> bool:
+        not_before = self._not_before.get(token_data["sub"])
+        if not_before is not None and token_data.get("iat", 0) < not_before:
+            return True
+
+        expires_at = self._revoked.get(token_data["jti"])
+        if expires_at is None:
+            return False
+        if expires_at < time.time():
+            del self._revoked[token_data["jti"]]
+            return False
+        return True
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(AUTH_EVENTS_CHANNEL)
+                # Loaded after subscribing so nothing revoked in between is missed; events
+                # that raced the load are applied again below, which is harmless
+                revoked, not_before = await load_revocations()
+                self._revoked = revoked
+                self._not_before = not_before
+                verified_tokens.clear()
+                self.ready = True
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    # A malformed event must not end mirroring for the rest of the process
+                    try:
+                        self._handle(json.loads(message["data"]))
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.warning("Ignoring malformed auth event %r: %r", message["data"], e)
+            except RedisError:
+                logger.warning("Auth events subscription lost, retrying in %ss", RECONNECT_DELAY)
+            finally:
+                self.ready = False
+                await pubsub.aclose()
+
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _handle(self, event: dict) -> None:
+        if event["kind"] == "jti":
+            self._revoked[event["id"]] = float(event["exp"])
+            verified_tokens.discard_jti(event["id"])
+            self._prune()
+        elif event["kind"] == "not_before":
+            self._not_before[event["id"]] = max(float(event["at"]), self._not_before.get(event["id"], 0))
+            self._prune()
+        elif event["kind"] == "user":
+            user_cache.discard(event["id"])
+
+    def _prune(self) -> None:
+        now = time.time()
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at < now]:
+            del self._revoked[jti]
+        horizon = now - REFRESH_TOKEN_EXPIRY.total_seconds()
+        for user_id in [user_id for user_id, at in self._not_before.items() if at < horizon]:
+            del self._not_before[user_id]
+
+
+auth_events = AuthEventListener()
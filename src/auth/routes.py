@@ -1,18 +1,23 @@
-from fastapi import APIRouter, Depends, status
-from .schemas import UserCreateModel, UserBase, UserLoginModel
+from fastapi import APIRouter, Depends, status, Query, Request
+from .schemas import UserCreateModel, UserBase, UserLoginModel, UserRoleUpdateModel, CurrentUser, UserPage
 from .service import UserService
 from src.db.database import get_session
+from src.db.replicas import get_read_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi.exceptions import HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from src.instrumentation import TimedRoute
 from src.auth.dependencies import RefreshTokenBearer, AccessTokenBearer, RoleChecker, get_current_user
+from src.auth.rate_limit import login_limiter, signup_limiter, refresh_limiter
+import uuid
 
-auth_router = APIRouter()
+auth_router = APIRouter(route_class=TimedRoute)
 user_service = UserService()
 role_checker = RoleChecker(["admin"])
 
 @auth_router.post("/signup", response_model=UserBase, status_code=status.HTTP_201_CREATED)
-async def create_user_account(user_data: UserCreateModel, session: AsyncSession = Depends(get_session)):
+async def create_user_account(request: Request, user_data: UserCreateModel, session: AsyncSession = Depends(get_session, scope="function")):
+    await signup_limiter.check(request)
     new_user = await user_service.register_user(user_data, session)
     
     if not new_user:
@@ -22,12 +27,20 @@ async def create_user_account(user_data: UserCreateModel, session: AsyncSession
         )
     return new_user
 
-@auth_router.get("/all_users", response_model=list[UserBase])
-async def get_all_users(session: AsyncSession = Depends(get_session)):
-    return await user_service.get_all_users(session)
+@auth_router.get("/all_users", response_model=UserPage)
+async def get_all_users(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    session: AsyncSession = Depends(get_read_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    payload = await user_service.get_users_page_json(session, limit=limit, cursor=cursor)
+    return Response(content=payload, media_type="application/json")
 
 @auth_router.post("/login")
-async def login_users(login_data: UserLoginModel, session: AsyncSession = Depends(get_session)):
+async def login_users(request: Request, login_data: UserLoginModel, session: AsyncSession = Depends(get_session, scope="function")):
+    # Before anything touches argon2
+    await login_limiter.check(request, email=login_data.email)
     result = await user_service.login_user(login_data, session)
 
     if not result:
@@ -56,9 +69,10 @@ async def login_users(login_data: UserLoginModel, session: AsyncSession = Depend
     return response
 
 @auth_router.get("/refresh_token")
-async def get_new_access_token(token_details: dict = Depends(RefreshTokenBearer())):
+async def get_new_access_token(request: Request, token_details: dict = Depends(RefreshTokenBearer()), session: AsyncSession = Depends(get_read_session, scope="function")):
+    await refresh_limiter.check(request, user_id=token_details["sub"])
     try:
-        result = user_service.refresh_access_token(token_details)
+        result = await user_service.refresh_access_token(token_details, session)
         return JSONResponse(content=result)
     except ValueError as e:
         raise HTTPException(
@@ -70,6 +84,21 @@ async def get_new_access_token(token_details: dict = Depends(RefreshTokenBearer(
 async def revoke_token(token_details:dict=Depends(AccessTokenBearer())):
     return await user_service.logout(token_details)
 
+@auth_router.post('/logout_all')
+async def revoke_all_tokens(token_details:dict=Depends(AccessTokenBearer())):
+    return await user_service.logout_all(token_details)
+
 @auth_router.get("/me")
 async def get_current_user(user=Depends(get_current_user), _:bool = Depends(role_checker)):
-    return user
\ No newline at end of file
+    return user
+
+@auth_router.patch("/users/{user_id}/role", response_model=CurrentUser)
+async def update_user_role(user_id: uuid.UUID, role_data: UserRoleUpdateModel, session: AsyncSession = Depends(get_session, scope="function"), _:bool = Depends(role_checker)):
+    user = await user_service.update_user_role(user_id, role_data.role, session)
+
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    return user
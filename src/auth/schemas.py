@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime, date
+from typing import Literal
 import uuid
 
 # Base model: common fields
@@ -17,6 +18,15 @@ class UserBase(BaseModel):
 class UserRead(UserBase):
     pass
 
+# One page of the user listing
+class UserPage(BaseModel):
+    items: list[UserRead]
+    next_cursor: str | None = None
+
+# Schema for the authenticated principal resolved on each request
+class CurrentUser(UserRead):
+    role: str
+
 # Schema for creating
 class UserCreateModel(BaseModel):
     username: str
@@ -29,3 +39,7 @@ class UserCreateModel(BaseModel):
 class UserLoginModel(BaseModel):
     email: str
     password: str
+
+# Schema for changing a user's role
+class UserRoleUpdateModel(BaseModel):
+    role: Literal["admin", "user"]
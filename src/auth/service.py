@@ -1,17 +1,24 @@
 from .models import User
-from .schemas import UserCreateModel
+from .schemas import UserCreateModel, UserPage, UserRead
 from .utils import generate_password_hash
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, desc
+from sqlalchemy import tuple_
+from pydantic import TypeAdapter
 from datetime import datetime
-from src.auth.utils import create_access_token, create_refresh_token, verify_password
+from src.auth.utils import create_access_token, create_refresh_token, verify_and_update_password, REFRESH_TOKEN_EXPIRY
 from fastapi import Depends
 from typing import Any
 from fastapi.responses import JSONResponse
 from fastapi import status
-from src.db.redis import add_jti_to_blocklist
+from src.db.redis import add_jti_to_blocklist, revoke_user_tokens
+from src.auth.cache import user_cache, user_page_cache
+from src.db.pagination import encode_cursor, decode_cursor
 import uuid
 
+USER_FIELDS = tuple(UserRead.model_fields)
+user_list_adapter = TypeAdapter(list[UserRead])
+
 class UserService:
     async def get_user_by_email(self, email: str, session: AsyncSession):
         statement = select(User).where(User.email == email)
@@ -41,7 +48,7 @@ class UserService:
 
         new_user = User(**user_data_dict)
 
-        new_user.password_hash = generate_password_hash(user_data_dict["password"])
+        new_user.password_hash = await generate_password_hash(user_data_dict["password"])
         new_user.role = "user"
 
         session.add(new_user)
@@ -51,23 +58,63 @@ class UserService:
 
         return new_user
 
-# Get all users
-    async def get_all_users(self, session: AsyncSession):
-        statement = select(User)
+    async def get_all_users(self, session: AsyncSession, limit: int = 50, cursor: str | None = None) -> UserPage:
+        # Only the listed columns are selected, so password_hash never leaves the database
+        columns = [getattr(User, name) for name in USER_FIELDS]
+        statement = (
+            select(*columns)
+            .order_by(desc(User.created_at), desc(User.uid))
+            .limit(limit + 1)
+        )
+
+        if cursor:
+            created_at, uid = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+            statement = statement.where(tuple_(User.created_at, User.uid) < (created_at, uid))
 
         result = await session.exec(statement)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].uid)
+
+        return UserPage.model_construct(
+            items=user_list_adapter.validate_python(rows, from_attributes=True),
+            next_cursor=next_cursor,
+        )
 
-        users = result.all()
+    async def get_users_page_json(self, session: AsyncSession, limit: int = 50, cursor: str | None = None) -> bytes:
+        async def load() -> bytes:
+            page = await self.get_all_users(session, limit, cursor)
+            return page.model_dump_json().encode()
+
+        return await user_page_cache.get_or_load(limit, cursor, load)
+
+    async def update_user_role(self, user_id: uuid.UUID, role: str, session: AsyncSession):
+        user = await self.get_user_by_id(user_id, session)
+
+        if user is None:
+            return None
+
+        user.role = role
+        await session.commit()
+        await user_cache.invalidate(str(user_id))
 
-        return users
+        return user
 
-    def refresh_access_token(self, token_details: dict):
+    async def refresh_access_token(self, token_details: dict, session: AsyncSession):
         expiry_timestamp = token_details.get("exp")
         user_id = token_details.get("sub")
 
         # Logic check
         if datetime.fromtimestamp(expiry_timestamp) > datetime.now():
-            new_access_token = create_access_token(user_id=user_id)
+            # Look the role up again so the role claim of the new token is current
+            user = await self.get_user_by_id(user_id, session)
+            if user is None:
+                raise ValueError("User no longer exists")
+
+            new_access_token = create_access_token(user_id=user_id, user_role=user.role)
             return {"access_token": new_access_token}
         
         raise ValueError("Token has expired")
@@ -86,9 +133,18 @@ class UserService:
         """Logic for verifying credentials and generating tokens."""
         user = await self.get_user_by_email(login_data.email, session)
 
-        if not user or not verify_password(login_data.password, user.password_hash):
+        if not user:
             return None # Or raise an InvalidCredentialsError
 
+        valid, new_hash = await verify_and_update_password(login_data.password, user.password_hash)
+        if not valid:
+            return None
+
+        # Transparently upgrade hashes created with older parameters
+        if new_hash is not None:
+            user.password_hash = new_hash
+            await session.commit()
+
         access_token = create_access_token(user_id=str(user.uid), user_role=user.role)
         refresh_token = create_refresh_token(user_id=str(user.uid))
 
@@ -102,7 +158,8 @@ class UserService:
     async def logout(self, token_details:dict):
         jti = token_details['jti']
 
-        await add_jti_to_blocklist(jti)
+        # Blocklisted until the token would have expired anyway, never less
+        await add_jti_to_blocklist(jti, token_details['exp'])
 
         return JSONResponse(
             content={
@@ -111,4 +168,14 @@ class UserService:
             status_code=status.HTTP_200_OK
         )
 
-        
\ No newline at end of file
+        
+    async def logout_all(self, token_details: dict):
+        """Revokes every access and refresh token issued to the user so far."""
+        await revoke_user_tokens(token_details['sub'], REFRESH_TOKEN_EXPIRY.total_seconds())
+
+        return JSONResponse(
+            content={
+                "message":"Logged Out Of All Sessions Successfully"
+            },
+            status_code=status.HTTP_200_OK
+        )
@@ -0,0 +1,63 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from src.config import Config
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified token payloads, keyed by the SHA-256 digest of
+    the raw token so a hit requires the exact bytes that passed signature checks.
+    Entries never outlive the token's own `exp`.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, Dict[str, Any]] = OrderedDict()
+        self._digests_by_jti: dict[str, bytes] = {}
+
+    def get(self, token: str) -> Dict[str, Any] | None:
+        digest = self._digest(token)
+        payload = self._entries.get(digest)
+        if payload is None:
+            return None
+
+        if payload["exp"] <= time.time():
+            del self._entries[digest]
+            self._forget(digest, payload)
+            return None
+
+        self._entries.move_to_end(digest)
+        return payload
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        digest = self._digest(token)
+        self._entries[digest] = payload
+        self._entries.move_to_end(digest)
+        self._digests_by_jti[payload["jti"]] = digest
+
+        while len(self._entries) > self.max_size:
+            oldest, evicted = self._entries.popitem(last=False)
+            self._forget(oldest, evicted)
+
+    def discard_jti(self, jti: str) -> None:
+        digest = self._digests_by_jti.pop(jti, None)
+        if digest is not None:
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._digests_by_jti.clear()
+
+    def _forget(self, digest: bytes, payload: Dict[str, Any]) -> None:
+        if self._digests_by_jti.get(payload["jti"]) == digest:
+            del self._digests_by_jti[payload["jti"]]
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+
+verified_tokens = VerifiedTokenCache(max_size=Config.TOKEN_CACHE_MAX_SIZE)
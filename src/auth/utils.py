@@ -4,21 +4,34 @@ import uuid
 import jwt
 
 from jwt import ExpiredSignatureError, InvalidTokenError
-from pwdlib import PasswordHash
 
+from src.auth.hashing import PasswordHasherPool
 from src.config import Config
 
 
-password_hash = PasswordHash.recommended()
+ACCESS_TOKEN_EXPIRY = timedelta(minutes=15)
+REFRESH_TOKEN_EXPIRY = timedelta(days=7)
+
+password_hasher = PasswordHasherPool(
+    kind=Config.PASSWORD_HASH_EXECUTOR,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_queue=Config.PASSWORD_HASH_MAX_QUEUE,
+)
 
 
 # -------- Password utils --------
-def generate_password_hash(password: str) -> str:
-    return password_hash.hash(password)
+async def generate_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    valid, _ = await password_hasher.verify_and_update(password, hashed_password)
+    return valid
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return password_hash.verify(password, hashed_password)
+async def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Also returns a fresh hash when the stored one uses outdated parameters."""
+    return await password_hasher.verify_and_update(password, hashed_password)
 
 
 # -------- Token helpers --------
@@ -31,7 +44,8 @@ def _generate_token(user_id: str, token_type: str, expires_delta: timedelta, ext
     payload: Dict[str, Any] = {
         "sub": user_id,
         "type": token_type,
-        "iat": now,
+        # Fractional, so tokens issued right after a logout-all in the same second stay valid
+        "iat": now.timestamp(),
         "exp": now + expires_delta,
         "jti": str(uuid.uuid4()),
         "iss": "auth-service",
@@ -47,11 +61,11 @@ def _generate_token(user_id: str, token_type: str, expires_delta: timedelta, ext
 
 # -------- Token factories --------
 def create_access_token(user_id: str, expires: timedelta | None = None, user_role: str = "user") -> str:
-    return _generate_token(user_id, "access", expires or timedelta(minutes=15), extra={"role": user_role})
+    return _generate_token(user_id, "access", expires or ACCESS_TOKEN_EXPIRY, extra={"role": user_role})
 
 
 def create_refresh_token(user_id: str, expires: timedelta | None = None) -> str:
-    return _generate_token(user_id, "refresh", expires or timedelta(days=7))
+    return _generate_token(user_id, "refresh", expires or REFRESH_TOKEN_EXPIRY)
 
 
 # -------- Decode + validation --------
@@ -1,2 +1 @@
-from .models import Book
-
+from .models import Book, BookTombstone
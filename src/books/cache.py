@@ -0,0 +1,135 @@
+import asyncio
+import uuid
+from typing import Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from src.config import Config
+from src.db.redis import cache_client, fill_if_current
+
+BOOK_KEY = "books:v1:{}"
+LOCK_SUFFIX = ":lock"
+GENERATION_SUFFIX = ":gen"
+# Generations only need to outlive any load still in flight when they were bumped
+GENERATION_TTL = 24 * 3600
+
+# How long a loader may hold the rebuild lock, and how often other workers poll for its result
+LOCK_TTL_MS = 5000
+LOCK_POLL_INTERVAL = 0.05
+
+
+class BookCache:
+    """
+    Read-through cache of serialized `BookRead` payloads.
+
+    Misses are single-flighted twice: concurrent requests in this process share one
+    load, and across processes a short Redis lock lets one worker rebuild the entry
+    while the others poll for it. Redis being unavailable degrades to a plain load.
+
+    Each entry has a generation that invalidation bumps. A load only fills the cache
+    if the generation is still the one it read before loading, so a load that raced
+    a write can't put the old version back.
+    """
+
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+
+    async def get_or_load(self, book_id: uuid.UUID, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        key = BOOK_KEY.format(book_id)
+
+        cached = await self._get(key)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload = await self._load(key, loader)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark as retrieved so a miss without waiters doesn't log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(payload)
+            return payload
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def peek(self, book_id: uuid.UUID) -> bytes | None:
+        """The cached payload, if any, without loading it on a miss."""
+        return await self._get(BOOK_KEY.format(book_id))
+
+    async def invalidate(self, *book_ids: uuid.UUID) -> None:
+        if not book_ids:
+            return
+        keys = [BOOK_KEY.format(book_id) for book_id in book_ids]
+        # Loads already under way in this process read before the write; later requests start their own
+        for key in keys:
+            self._inflight.pop(key, None)
+        try:
+            async with cache_client.pipeline(transaction=False) as pipe:
+                # Bumped before the delete, so a fill landing between the two is deleted with the rest
+                for key in keys:
+                    pipe.incr(key + GENERATION_SUFFIX)
+                    pipe.expire(key + GENERATION_SUFFIX, GENERATION_TTL)
+                pipe.delete(*keys)
+                await pipe.execute()
+        except RedisError:
+            pass
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        lock_key = key + LOCK_SUFFIX
+        try:
+            async with cache_client.pipeline(transaction=False) as pipe:
+                pipe.set(lock_key, b"1", nx=True, px=LOCK_TTL_MS)
+                pipe.get(key + GENERATION_SUFFIX)
+                acquired, generation = await pipe.execute()
+        except RedisError:
+            return await loader()
+
+        if not acquired:
+            # Another worker is rebuilding this entry; wait for it rather than hitting the database too
+            for _ in range(int(LOCK_TTL_MS / 1000 / LOCK_POLL_INTERVAL)):
+                await asyncio.sleep(LOCK_POLL_INTERVAL)
+                try:
+                    async with cache_client.pipeline(transaction=False) as pipe:
+                        pipe.get(key)
+                        pipe.exists(lock_key)
+                        cached, locked = await pipe.execute()
+                except RedisError:
+                    break
+                if cached is not None:
+                    return cached
+                if not locked:
+                    # Released without a fill: its load failed or went stale, so don't wait out the lock
+                    break
+            return await loader()
+
+        try:
+            payload = await loader()
+            try:
+                await fill_if_current(key, key + GENERATION_SUFFIX, generation, payload, self.ttl)
+            except RedisError:
+                pass
+            return payload
+        finally:
+            try:
+                await cache_client.delete(lock_key)
+            except RedisError:
+                pass
+
+    async def _get(self, key: str) -> bytes | None:
+        try:
+            return await cache_client.get(key)
+        except RedisError:
+            return None
+
+
+book_cache = BookCache(ttl=Config.BOOK_CACHE_TTL)
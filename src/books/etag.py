@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Header, HTTPException, status
+
+from src.config import Config
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def book_etag(updated_at: datetime) -> str:
+    """Strong ETag for a book's current version, derived from `updated_at`."""
+    return f'"{(updated_at - EPOCH) // MICROSECOND:x}"'
+
+
+def list_etag(updated_at: datetime | None, count: int) -> str:
+    """ETag for a listing, from the latest `updated_at` and the row count of its filtered set."""
+    version = (updated_at - EPOCH) // MICROSECOND if updated_at is not None else 0
+    return f'"{version:x}-{count:x}"'
+
+
+def validator_headers(etag: str, updated_at: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if updated_at is not None:
+        # updated_at is naive UTC, as written by datetime.utcnow
+        headers["Last-Modified"] = format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def parse_etag(etag: str) -> datetime | None:
+    if len(etag) < 3 or not (etag.startswith('"') and etag.endswith('"')):
+        return None
+    try:
+        return EPOCH + int(etag[1:-1], 16) * MICROSECOND
+    except (ValueError, OverflowError):
+        return None
+
+
+def if_match(if_match: str | None = Header(default=None)) -> list[datetime] | None:
+    """
+    `updated_at` versions a write must match, or None when any version will do.
+
+    Weak or malformed tags can never match under If-Match's strong comparison, so
+    they are dropped and the write fails its precondition.
+    """
+    if if_match is None:
+        if Config.BOOK_REQUIRE_IF_MATCH:
+            raise HTTPException(
+                status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+                detail="If-Match header is required",
+            )
+        return None
+
+    tags = [tag.strip() for tag in if_match.split(",")]
+    if "*" in tags:
+        return None
+    return [version for version in map(parse_etag, tags) if version is not None]
+
+
+class ReadPreconditions:
+    """If-None-Match / If-Modified-Since of a GET, evaluated as RFC 9110 specifies."""
+
+    def __init__(self, if_none_match: str | None, if_modified_since: str | None) -> None:
+        self.if_none_match = if_none_match
+        self.if_modified_since = if_modified_since
+
+    def __bool__(self) -> bool:
+        return self.if_none_match is not None or self.if_modified_since is not None
+
+    def not_modified(self, etag: str, updated_at: datetime | None) -> bool:
+        if self.if_none_match is not None:
+            # Weak comparison: W/ prefixes are ignored, and If-Modified-Since is not consulted
+            tags = [tag.strip().removeprefix("W/") for tag in self.if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if updated_at is None:
+            return False
+        try:
+            since = parsedate_to_datetime(self.if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates have second precision
+        return updated_at.replace(microsecond=0) <= since.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def read_preconditions(
+    if_none_match: str | None = Header(default=None),
+    if_modified_since: str | None = Header(default=None),
+) -> ReadPreconditions:
+    return ReadPreconditions(if_none_match, if_modified_since)
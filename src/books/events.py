@@ -0,0 +1,287 @@
+"""
+Push of book changes to SSE and WebSocket subscribers through Postgres LISTEN/NOTIFY.
+
+`BookService` writes queue one NOTIFY per changed book on the writing transaction,
+so events go out only once it commits. Each worker keeps a single LISTEN connection
+and fans every event out to its subscribers' bounded queues; a subscriber that
+falls a whole queue behind is evicted instead of buffered without limit.
+
+Bulk ingestion through `src.books.ingest` does not notify: a million-row import
+would flood every subscriber. Clients catch up on it through GET /books/changes.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator
+import uuid
+
+import asyncpg
+import orjson
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import Text, bindparam, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import Receive, Scope, Send
+
+from src.config import Config
+from src.metrics import BOOK_EVENT_EVICTIONS, BOOK_EVENT_SUBSCRIBERS, BOOK_EVENTS_DELIVERED
+
+logger = logging.getLogger(__name__)
+
+BOOK_EVENTS_CHANNEL = "book_changes"
+RECONNECT_DELAY = 1.0
+HEALTH_INTERVAL = 10.0
+HEALTH_TIMEOUT = 5.0
+SSE_RETRY_MS = 5000
+
+
+class BookEvent:
+    """One message, encoded once for every transport and shared by all subscribers."""
+
+    __slots__ = ("kind", "text", "sse")
+
+    def __init__(self, kind: str, data: bytes) -> None:
+        self.kind = kind
+        self.text = data.decode()
+        self.sse = b"event: " + kind.encode() + b"\ndata: " + data + b"\n\n"
+
+
+# Sent after the listener (re)connects: changes committed meanwhile were missed, so
+# clients should catch up through the change feed
+RESET = BookEvent("reset", b"{}")
+EVICTED = BookEvent("closed", b'{"reason":"slow_consumer"}')
+SHUTDOWN = BookEvent("closed", b'{"reason":"shutdown"}')
+KEEPALIVE = BookEvent("ping", b"{}")
+
+
+def upsert_change(book: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "change": "upsert",
+        "uid": book["uid"],
+        "changed_at": book["updated_at"],
+        "language": book["language"],
+        "author": book["author"],
+        "book": book,
+    }
+
+
+def delete_change(uid: uuid.UUID, language: str, author: str, deleted_at: datetime) -> dict[str, Any]:
+    return {
+        "change": "delete",
+        "uid": uid,
+        "changed_at": deleted_at,
+        "language": language,
+        "author": author,
+        "book": None,
+    }
+
+
+async def notify_book_changes(session: AsyncSession, changes: list[dict[str, Any]]) -> None:
+    """Queue a NOTIFY per change on the session's transaction; listeners receive them on commit."""
+    if not Config.BOOK_EVENTS_ENABLED or not changes:
+        return
+
+    payloads = func.unnest(
+        bindparam("payloads", [orjson.dumps(change).decode() for change in changes], type_=pg.ARRAY(Text))
+    ).table_valued("payload").render_derived()
+    await session.exec(select(func.pg_notify(BOOK_EVENTS_CHANNEL, payloads.c.payload)))
+
+
+class Subscription:
+    def __init__(self, hub: "BookEventHub", key: tuple[str | None, str | None], queue_size: int) -> None:
+        self.hub = hub
+        self.key = key
+        self.queue: asyncio.Queue[BookEvent] = asyncio.Queue(queue_size)
+
+    async def get(self) -> BookEvent:
+        return await self.queue.get()
+
+    def offer(self, event: BookEvent) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def end(self, event: BookEvent) -> None:
+        # The backlog is dropped so the closing message is the next thing the client sees
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+        self.close()
+
+    def close(self) -> None:
+        self.hub.remove(self)
+
+
+class BookEventHub:
+    """
+    Per-worker fan-out of book change notifications.
+
+    Subscribers are indexed by their (language, author) filter, either part possibly
+    None for "any", so routing an event costs four dictionary lookups whatever the
+    number of subscribers, and delivery never waits on a client.
+    """
+
+    def __init__(self, dsn: str, queue_size: int, max_subscribers: int) -> None:
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: dict[tuple[str | None, str | None], set[Subscription]] = {}
+        self._count = 0
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, language: str | None = None, author: str | None = None) -> Subscription:
+        if self._task is None:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Book events are not enabled")
+        if self._count >= self.max_subscribers:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many event subscribers")
+
+        subscription = Subscription(self, (language, author), self.queue_size)
+        self._subscribers.setdefault(subscription.key, set()).add(subscription)
+        self._count += 1
+        BOOK_EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def remove(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.key)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.key]
+        self._count -= 1
+        BOOK_EVENT_SUBSCRIBERS.dec()
+
+    def publish(self, event: BookEvent, language: str, author: str) -> None:
+        delivered = 0
+        for key in {(language, author), (language, None), (None, author), (None, None)}:
+            for subscription in list(self._subscribers.get(key, ())):
+                if subscription.offer(event):
+                    delivered += 1
+                else:
+                    subscription.end(EVICTED)
+                    BOOK_EVENT_EVICTIONS.inc()
+        BOOK_EVENTS_DELIVERED.inc(delivered)
+
+    def broadcast(self, event: BookEvent) -> None:
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                if not subscription.offer(event):
+                    subscription.end(EVICTED)
+                    BOOK_EVENT_EVICTIONS.inc()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Lets open streams finish instead of holding up shutdown
+        for subscribers in list(self._subscribers.values()):
+            for subscription in list(subscribers):
+                subscription.end(SHUTDOWN)
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(BOOK_EVENTS_CHANNEL, self._on_notify)
+                self.broadcast(RESET)
+                while True:
+                    await asyncio.sleep(HEALTH_INTERVAL)
+                    async with asyncio.timeout(HEALTH_TIMEOUT):
+                        await connection.fetchval("SELECT 1")
+            except (OSError, TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.warning("Book events listener lost its connection, retrying in %ss", RECONNECT_DELAY)
+            finally:
+                if connection is not None:
+                    connection.terminate()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        change = orjson.loads(payload)
+        self.publish(BookEvent("book", payload.encode()), change["language"], change["author"])
+
+
+async def sse_stream(subscription: Subscription, keepalive: float) -> AsyncIterator[bytes]:
+    yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.get(), keepalive)
+        except TimeoutError:
+            # A comment line; keeps proxies from timing out an idle stream
+            yield b": keepalive\n\n"
+            continue
+        yield event.sse
+        if event.kind == "closed":
+            return
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    Server-sent events for a subscription, released however the response ends. A
+    generator's own finally would not run for a client gone before its first chunk.
+    """
+
+    def __init__(self, subscription: Subscription, keepalive: float) -> None:
+        super().__init__(
+            sse_stream(subscription, keepalive),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscription = subscription
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.subscription.close()
+
+
+async def websocket_stream(websocket: WebSocket, subscription: Subscription, keepalive: float) -> None:
+    """Accept `websocket` and stream `subscription` to it; the subscription is released however this ends."""
+    async def send() -> None:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), keepalive)
+            except TimeoutError:
+                event = KEEPALIVE
+            await websocket.send_text(f'{{"event":"{event.kind}","data":{event.text}}}')
+            if event.kind == "closed":
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+
+    async def receive() -> None:
+        # Nothing is expected from the client; this returns once it disconnects
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks: list[asyncio.Task] = []
+    try:
+        await websocket.accept()
+        tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+        # The client leaving ends the stream, and so does the sender closing it or failing
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        subscription.close()
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception) and not isinstance(result, WebSocketDisconnect):
+                logger.error("Book events WebSocket failed", exc_info=result)
+
+
+book_events = BookEventHub(
+    dsn=(Config.BOOK_EVENTS_LISTEN_URL or Config.DATABASE_URL).replace("postgresql+asyncpg://", "postgresql://"),
+    queue_size=Config.BOOK_EVENTS_QUEUE_SIZE,
+    max_subscribers=Config.BOOK_EVENTS_MAX_SUBSCRIBERS,
+)
@@ -0,0 +1,327 @@
+"""
+Write-behind ingestion of large book imports through a Redis Stream.
+
+`IngestQueue.submit` validates rows, appends them to the stream in chunks and
+returns the job right away; `IngestWorker` drains the stream through a consumer
+group in micro-batches, one multi-row INSERT per batch. Rows failing validation or
+a database constraint go to a dead-letter stream and to the job's error list.
+
+Run a standalone consumer with `python -m src.books.ingest`.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime
+from typing import Any, Iterable
+
+import orjson
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+
+from src.books.schemas import BookCreate, BulkItemError, IngestJob
+from src.books.service import BookService
+from src.config import Config
+from src.db.database import WriteSession
+from src.db.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "books:ingest"
+DEAD_LETTER_KEY = "books:ingest:dead"
+CONSUMER_GROUP = "ingest-workers"
+JOB_KEY = "books:ingest:job:{}"
+JOB_ERRORS_KEY = "books:ingest:job:{}:errors"
+
+# Errors kept per job for the errors endpoint; the dead-letter stream keeps the rows themselves
+JOB_ERRORS_LIMIT = 1000
+DEAD_LETTER_MAXLEN = 100_000
+READ_BLOCK_MS = 2000
+RETRY_DELAY = 1.0
+JOB_REPLIES = 5
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines")
+
+
+def validation_detail(e: ValidationError) -> list[dict[str, Any]]:
+    return e.errors(include_url=False, include_context=False, include_input=False)
+
+
+def ingest_uid(job_id: str, index: int) -> uuid.UUID:
+    # Deterministic, so a batch redelivered after a crash inserts nothing twice
+    return uuid.uuid5(uuid.UUID(job_id), str(index))
+
+
+class IngestQueue:
+    def __init__(self, chunk_rows: int, job_ttl: int) -> None:
+        self.chunk_rows = chunk_rows
+        self.job_ttl = job_ttl
+
+    async def submit(self, rows: Iterable[Any]) -> IngestJob:
+        job_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        valid: list[tuple[int, dict[str, Any]]] = []
+        rejected: list[tuple[int, Any, Any]] = []
+
+        for index, row in enumerate(rows):
+            try:
+                valid.append((index, BookCreate.model_validate(row).model_dump(mode="json")))
+            except ValidationError as e:
+                rejected.append((index, row, validation_detail(e)))
+            if index % self.chunk_rows == self.chunk_rows - 1:
+                # A million rows take seconds to validate; let other requests on this worker run meanwhile
+                await asyncio.sleep(0)
+
+        job = IngestJob(
+            job_id=job_id,
+            status="queued" if valid else "completed",
+            total=len(valid) + len(rejected),
+            processed=len(rejected),
+            failed=len(rejected),
+            created_at=now,
+            updated_at=now,
+        )
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.hset(JOB_KEY.format(job_id), mapping=job.model_dump(mode="json", exclude={"job_id"}))
+            pipe.expire(JOB_KEY.format(job_id), self.job_ttl)
+            for index, row, detail in rejected:
+                self.dead_letter(pipe, job_id, index, row, detail)
+            for start in range(0, len(valid), self.chunk_rows):
+                pipe.xadd(STREAM_KEY, {"job": job_id, "rows": orjson.dumps(valid[start:start + self.chunk_rows])})
+            await pipe.execute()
+
+        return job
+
+    async def get_job(self, job_id: uuid.UUID) -> IngestJob | None:
+        fields = await redis_client.hgetall(JOB_KEY.format(job_id))
+        if not fields:
+            return None
+        return IngestJob(job_id=job_id, **fields)
+
+    async def get_errors(self, job_id: uuid.UUID) -> list[BulkItemError]:
+        entries = await redis_client.lrange(JOB_ERRORS_KEY.format(job_id), 0, -1)
+        return [BulkItemError(**orjson.loads(entry)) for entry in entries]
+
+    def dead_letter(self, pipe, job_id: str, index: int, row: Any, detail: Any) -> None:
+        key = JOB_ERRORS_KEY.format(job_id)
+        pipe.rpush(key, orjson.dumps({"index": index, "detail": detail}))
+        pipe.ltrim(key, 0, JOB_ERRORS_LIMIT - 1)
+        pipe.expire(key, self.job_ttl)
+        pipe.xadd(
+            DEAD_LETTER_KEY,
+            {"job": job_id, "index": index, "row": orjson.dumps(row, default=str), "error": orjson.dumps(detail)},
+            maxlen=DEAD_LETTER_MAXLEN,
+            approximate=True,
+        )
+
+
+class IngestWorker:
+    """
+    Consumer-group reader of the ingest stream.
+
+    Entries are acknowledged only after their rows are committed, so a worker dying
+    mid-batch leaves them pending; another consumer claims them once they have been
+    idle for `claim_idle_ms`, and the deterministic uids make the replay a no-op for
+    rows that were already inserted.
+    """
+
+    def __init__(self, queue: IngestQueue, batch_rows: int, claim_idle_ms: int) -> None:
+        self.queue = queue
+        self.batch_rows = batch_rows
+        self.claim_idle_ms = claim_idle_ms
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.book_service = BookService()
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        group_ready = False
+        # Entries this consumer name read before a restart come first
+        backlog = True
+        while True:
+            try:
+                if not group_ready:
+                    await self._ensure_group()
+                    group_ready = True
+                entries = await self._claim()
+                if not entries:
+                    entries = await self._read("0" if backlog else ">")
+                    backlog = backlog and bool(entries)
+                if entries:
+                    await self.process(entries)
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, DBAPIError, OSError):
+                # Unacknowledged entries stay pending and are read again
+                logger.exception("Ingest batch failed; retrying")
+                backlog = True
+                await asyncio.sleep(RETRY_DELAY)
+
+    async def _ensure_group(self) -> None:
+        try:
+            await redis_client.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _read(self, stream_id: str) -> list[tuple[str, dict[str, str]]]:
+        response = await redis_client.xreadgroup(
+            CONSUMER_GROUP,
+            self.consumer,
+            {STREAM_KEY: stream_id},
+            count=max(1, self.batch_rows // self.queue.chunk_rows),
+            block=READ_BLOCK_MS if stream_id == ">" else None,
+        )
+        return response[0][1] if response else []
+
+    async def _claim(self) -> list[tuple[str, dict[str, str]]]:
+        response = await redis_client.xautoclaim(
+            STREAM_KEY,
+            CONSUMER_GROUP,
+            self.consumer,
+            min_idle_time=self.claim_idle_ms,
+            count=max(1, self.batch_rows // self.queue.chunk_rows),
+        )
+        # Entries deleted while pending come back without fields
+        return [entry for entry in response[1] if entry[1]]
+
+    async def process(self, entries: list[tuple[str, dict[str, str]]]) -> None:
+        rows_by_job: dict[str, list[tuple[int, dict[str, Any]]]] = {}
+        for _, fields in entries:
+            rows_by_job.setdefault(fields["job"], []).extend(orjson.loads(fields["rows"]))
+
+        rows, failures = [], []
+        for job_id, job_rows in rows_by_job.items():
+            for index, row in job_rows:
+                try:
+                    book = BookCreate.model_validate(row)
+                except ValidationError as e:
+                    failures.append((job_id, index, row, validation_detail(e)))
+                    continue
+                rows.append((job_id, index, row, {"uid": ingest_uid(job_id, index), **book.model_dump()}))
+
+        failures += await self._insert(rows)
+
+        failed = {(job_id, index) for job_id, index, _, _ in failures}
+        entry_ids = [entry_id for entry_id, _ in entries]
+        async with redis_client.pipeline(transaction=True) as pipe:
+            for job_id, index, row, detail in failures:
+                self.queue.dead_letter(pipe, job_id, index, row, detail)
+            pipe.xack(STREAM_KEY, CONSUMER_GROUP, *entry_ids)
+            # Acknowledged entries are done with; keep the stream to what is still in flight
+            pipe.xdel(STREAM_KEY, *entry_ids)
+            for job_id, job_rows in rows_by_job.items():
+                job_failed = sum((job_id, index) in failed for index, _ in job_rows)
+                key = JOB_KEY.format(job_id)
+                pipe.hset(key, mapping={"status": "running", "updated_at": datetime.utcnow().isoformat()})
+                pipe.hincrby(key, "failed", job_failed)
+                pipe.hincrby(key, "inserted", len(job_rows) - job_failed)
+                pipe.hincrby(key, "processed", len(job_rows))
+                pipe.hget(key, "total")
+            results = await pipe.execute()
+
+        # The last five replies of each job are its hset, three counters and total
+        job_results = results[len(results) - JOB_REPLIES * len(rows_by_job):]
+        finished = [
+            job_id
+            for position, job_id in enumerate(rows_by_job)
+            if int(job_results[JOB_REPLIES * position + 3]) >= int(job_results[JOB_REPLIES * position + 4])
+        ]
+        if finished:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for job_id in finished:
+                    pipe.hset(JOB_KEY.format(job_id), "status", "completed")
+                await pipe.execute()
+
+    async def _insert(self, rows: list[tuple[str, int, Any, dict[str, Any]]]) -> list[tuple[str, int, Any, Any]]:
+        """Insert a batch in one statement; if it fails, isolate the bad rows one by one."""
+        if not rows:
+            return []
+        async with WriteSession() as session:
+            try:
+                await self.book_service.insert_ingested_books(session, [values for *_, values in rows])
+                await session.commit()
+                return []
+            except (IntegrityError, DataError):
+                await session.rollback()
+
+            failures = []
+            for job_id, index, row, values in rows:
+                try:
+                    async with session.begin_nested():
+                        await self.book_service.insert_ingested_books(session, [values])
+                except (IntegrityError, DataError) as e:
+                    failures.append((job_id, index, row, str(e.orig)))
+            await session.commit()
+            return failures
+
+ingest_queue = IngestQueue(chunk_rows=Config.INGEST_CHUNK_ROWS, job_ttl=Config.INGEST_JOB_TTL)
+ingest_worker = IngestWorker(ingest_queue, batch_rows=Config.INGEST_BATCH_ROWS, claim_idle_ms=Config.INGEST_CLAIM_IDLE_MS)
+
+
+async def read_ingest_rows(request: Request, max_rows: int, max_bytes: int) -> list[Any]:
+    """Rows of an ingest request body: a JSON array, or one JSON object per line for NDJSON."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    received = 0
+    try:
+        if content_type in NDJSON_MEDIA_TYPES:
+            rows, pending = [], b""
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise body_too_large(max_bytes)
+                *lines, pending = (pending + chunk).split(b"\n")
+                rows.extend(orjson.loads(line) for line in lines if line.strip())
+                if len(rows) > max_rows:
+                    break
+            else:
+                # Only a fully read body ends in a whole last line; after the break
+                # above it is a fragment, and the request is rejected as too large
+                if pending.strip():
+                    rows.append(orjson.loads(pending))
+        else:
+            body = bytearray()
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise body_too_large(max_bytes)
+                body += chunk
+            rows = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON: {e}")
+
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of books")
+    if len(rows) > max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {max_rows} books per ingest job",
+        )
+    return rows
+
+
+def body_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Ingest bodies are limited to {max_bytes} bytes",
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(ingest_worker.run())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlmodel import SQLModel, Field
 import sqlalchemy.dialects.postgresql as pg
 from datetime import datetime, date
@@ -6,6 +6,20 @@ import uuid
 
 class Book(SQLModel, table=True):
     __tablename__ = "books"
+    __table_args__ = (
+        # Backs the keyset pagination of the list endpoint: ORDER BY created_at DESC, uid DESC
+        Index("ix_books_created_at_uid", "created_at", "uid"),
+        # Equality filters of the list endpoint combined with its default sort
+        Index("ix_books_author_created_at_uid", "author", "created_at", "uid"),
+        Index("ix_books_publisher_created_at_uid", "publisher", "created_at", "uid"),
+        Index("ix_books_language_created_at_uid", "language", "created_at", "uid"),
+        # Range filters, which double as the keyset for their sort orders
+        Index("ix_books_published_date_uid", "published_date", "uid"),
+        Index("ix_books_page_count_uid", "page_count", "uid"),
+        # max(updated_at) for the list endpoint's ETag and Last-Modified, and the keyset
+        # of the change feed: WHERE (updated_at, uid) > cursor ORDER BY updated_at, uid
+        Index("ix_books_updated_at_uid", "updated_at", "uid"),
+    )
 
     uid: uuid.UUID = Field(
         sa_column=Column(
@@ -30,4 +44,19 @@ class Book(SQLModel, table=True):
     )
 
     def __repr__(self) -> str:
-        return f"<Book {self.title}>"
\ No newline at end of file
+        return f"<Book {self.title}>"
+
+
+class BookTombstone(SQLModel, table=True):
+    """A deleted book, kept so the change feed can tell clients to drop it."""
+    __tablename__ = "book_tombstones"
+    __table_args__ = (
+        Index("ix_book_tombstones_deleted_at_uid", "deleted_at", "uid"),
+    )
+
+    uid: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True)
+    )
+    deleted_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP, nullable=False)
+    )
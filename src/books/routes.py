@@ -1,36 +1,250 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Body, Request, WebSocket
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from typing import Any, Literal
 from sqlmodel.ext.asyncio.session import AsyncSession
-from src.books.schemas import BookCreate, BookUpdate, BookRead
+from src.books.schemas import (
+    BookCreate,
+    BookUpdate,
+    BookRead,
+    BookPage,
+    BookChangePage,
+    BookFilter,
+    BookBulkResult,
+    BookBulkDeleteResult,
+    BulkItemError,
+    IngestJob,
+)
+from src.books.ingest import ingest_queue, read_ingest_rows
+from src.books.events import EventStreamResponse, book_events, websocket_stream
 from src.books.service import BookService
+from src.books.serialization import (
+    page_response,
+    change_page_response,
+    book_response,
+    book_json_response,
+    model_response,
+    not_modified_response,
+)
+from src.books.etag import ReadPreconditions, if_match, read_preconditions, book_etag, list_etag, validator_headers
+from datetime import datetime
 from src.db.database import get_session
+from src.db.replicas import get_read_session, get_read_engine
+from sqlalchemy.ext.asyncio import AsyncEngine
 import uuid
-from src.auth.dependencies import RoleChecker
+from src.instrumentation import TimedRoute
+from src.auth.dependencies import RoleChecker, access_token_bearer
+from src.config import Config
 
 
-book_router = APIRouter()
+book_router = APIRouter(route_class=TimedRoute, default_response_class=ORJSONResponse)
 book_service = BookService()
 role_checker = RoleChecker(["admin", "user"])
+export_role_checker = RoleChecker(["admin"])
 
-@book_router.get("", response_model=list[BookRead])
-async def get_all_books(session: AsyncSession = Depends(get_session), _:bool = Depends(role_checker)):
-    return await book_service.get_all_books(session)
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+@book_router.get("", response_model=BookPage)
+async def get_all_books(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    fields: str | None = Query(None, description="Comma-separated list of fields to return"),
+    filters: BookFilter = Depends(),
+    preconditions: ReadPreconditions = Depends(read_preconditions),
+    session: AsyncSession = Depends(get_read_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    # Only the ETag validates a listing: a delete lowers the count it carries, but
+    # leaves the latest updated_at, and so Last-Modified, where it was
+    updated_at, count = await book_service.get_list_version(session, filters)
+    headers = {"ETag": list_etag(updated_at, count)}
+    if preconditions and preconditions.not_modified(headers["ETag"], None):
+        return not_modified_response(headers)
+
+    selected = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    page = await book_service.get_all_books(session, limit=limit, cursor=cursor, fields=selected, filters=filters)
+    return page_response(page, headers=headers)
 
 
 @book_router.post("", status_code=status.HTTP_201_CREATED, response_model=BookRead)
-async def create_a_book(book_data: BookCreate, session: AsyncSession = Depends(get_session), _:bool = Depends(role_checker)):
-    return await book_service.create_book(session, book_data)
+async def create_a_book(book_data: BookCreate, session: AsyncSession = Depends(get_session, scope="function"), _:bool = Depends(role_checker)):
+    book = await book_service.create_book(session, book_data)
+    return book_response(book, status_code=status.HTTP_201_CREATED)
+
+
+@book_router.get("/search", response_model=BookPage)
+async def search_books(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque cursor returned as next_cursor by the previous page"),
+    session: AsyncSession = Depends(get_read_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    page = await book_service.search_books(session, q, limit=limit, cursor=cursor)
+    return page_response(page)
+
+
+@book_router.get("/changes", response_model=BookChangePage)
+async def get_book_changes(
+    since: str | None = Query(None, description="next_cursor of the previous sync; omit to start from the oldest book"),
+    limit: int = Query(500, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    page = await book_service.get_changes(session, since=since, limit=limit)
+    return change_page_response(page)
+
+
+@book_router.get("/events", response_class=StreamingResponse)
+async def stream_book_events(
+    language: str | None = Query(None),
+    author: str | None = Query(None),
+    _:bool = Depends(role_checker),
+):
+    """Server-sent events for books created, updated or deleted from now on, optionally filtered."""
+    subscription = book_events.subscribe(language=language, author=author)
+    return EventStreamResponse(subscription, Config.BOOK_EVENTS_KEEPALIVE)
+
+
+@book_router.websocket("/events/ws")
+async def book_events_socket(
+    websocket: WebSocket,
+    language: str | None = None,
+    author: str | None = None,
+    token: str | None = None,
+):
+    # Browsers can't set headers on a WebSocket handshake, so the token may come as a query parameter
+    authorization = websocket.headers.get("authorization", "")
+    token = token or authorization.removeprefix("Bearer ").strip()
+    try:
+        token_data = await access_token_bearer.verify(token)
+        await role_checker(token_data)
+        subscription = book_events.subscribe(language=language, author=author)
+    except HTTPException as e:
+        code = status.WS_1013_TRY_AGAIN_LATER if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE else status.WS_1008_POLICY_VIOLATION
+        await websocket.close(code=code, reason=str(e.detail))
+        return
+
+    await websocket_stream(websocket, subscription, Config.BOOK_EVENTS_KEEPALIVE)
+
+
+@book_router.get("/export", response_class=StreamingResponse)
+async def export_books(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    bind: AsyncEngine = Depends(get_read_engine),
+    _:bool = Depends(export_role_checker),
+):
+    return StreamingResponse(
+        book_service.export_books(format, Config.BOOK_EXPORT_CHUNK_SIZE, bind),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'},
+    )
+
+
+@book_router.post("/bulk", status_code=status.HTTP_201_CREATED, response_model=BookBulkResult)
+async def bulk_create_books(
+    items: list[dict[str, Any]] = Body(..., max_length=Config.BOOK_BULK_MAX_ITEMS),
+    copy: bool = Query(False, description="Insert through COPY; fastest for very large batches"),
+    session: AsyncSession = Depends(get_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    result = await book_service.bulk_create_books(session, items, use_copy=copy)
+    return model_response(result, status_code=status.HTTP_201_CREATED)
+
+
+@book_router.patch("/bulk", response_model=BookBulkResult)
+async def bulk_update_books(
+    items: list[dict[str, Any]] = Body(..., max_length=Config.BOOK_BULK_MAX_ITEMS),
+    session: AsyncSession = Depends(get_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    result = await book_service.bulk_update_books(session, items)
+    return model_response(result)
+
+
+@book_router.delete("/bulk", response_model=BookBulkDeleteResult)
+async def bulk_delete_books(
+    uids: list[uuid.UUID] = Body(..., max_length=Config.BOOK_BULK_MAX_ITEMS),
+    session: AsyncSession = Depends(get_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    return await book_service.bulk_delete_books(session, uids)
+
+
+@book_router.post(
+    "/ingest",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=IngestJob,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                # BookCreate is already in the components through POST /books
+                "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/BookCreate"}}},
+                "application/x-ndjson": {"schema": {"$ref": "#/components/schemas/BookCreate"}},
+            },
+        }
+    },
+)
+async def ingest_books(request: Request, _:bool = Depends(role_checker)):
+    # Validated and queued only; a background consumer inserts the rows
+    rows = await read_ingest_rows(request, Config.INGEST_MAX_ROWS, Config.INGEST_MAX_BODY_BYTES)
+    job = await ingest_queue.submit(rows)
+    return model_response(job, status_code=status.HTTP_202_ACCEPTED)
+
+
+@book_router.get("/ingest/{job_id}", response_model=IngestJob)
+async def get_ingest_job(job_id: uuid.UUID, _:bool = Depends(role_checker)):
+    job = await ingest_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingest job not found")
+    return model_response(job)
+
+
+@book_router.get("/ingest/{job_id}/errors", response_model=list[BulkItemError])
+async def get_ingest_errors(job_id: uuid.UUID, _:bool = Depends(role_checker)):
+    if await ingest_queue.get_job(job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingest job not found")
+    return await ingest_queue.get_errors(job_id)
 
 
 @book_router.get("/{book_id}", response_model=BookRead)
-async def get_book(book_id: uuid.UUID, session: AsyncSession = Depends(get_session), _:bool = Depends(role_checker)):
-    return await book_service.get_book_by_id(session, book_id)
+async def get_book(
+    book_id: uuid.UUID,
+    preconditions: ReadPreconditions = Depends(read_preconditions),
+    session: AsyncSession = Depends(get_read_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    if preconditions:
+        updated_at = await book_service.get_book_version(session, book_id)
+        headers = validator_headers(book_etag(updated_at), updated_at)
+        if preconditions.not_modified(headers["ETag"], updated_at):
+            return not_modified_response(headers)
+
+    # Cached payloads are already BookRead JSON, so skip response_model validation
+    payload = await book_service.get_book_json(book_id)
+    return book_json_response(payload)
 
 
 @book_router.patch("/{book_id}", response_model=BookRead)
-async def update_book(book_id: uuid.UUID, book_update_data: BookUpdate, session: AsyncSession = Depends(get_session), _:bool = Depends(role_checker)):
-    return await book_service.update_book(session, book_id, book_update_data)
+async def update_book(
+    book_id: uuid.UUID,
+    book_update_data: BookUpdate,
+    expected: list[datetime] | None = Depends(if_match),
+    session: AsyncSession = Depends(get_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    book = await book_service.update_book(session, book_id, book_update_data, expected)
+    return book_response(book)
 
 
 @book_router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_book(book_id: uuid.UUID, session: AsyncSession = Depends(get_session), _:bool = Depends(role_checker)):
-    return await book_service.delete_book(session, book_id)
+async def delete_book(
+    book_id: uuid.UUID,
+    expected: list[datetime] | None = Depends(if_match),
+    session: AsyncSession = Depends(get_session, scope="function"),
+    _:bool = Depends(role_checker),
+):
+    await book_service.delete_book(session, book_id, expected)
@@ -1,15 +1,22 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date, datetime
+from typing import Any, Literal
 import uuid
 
 
+# Mirror the column limits of the books table, so a bad item fails validation instead of its batch
+TEXT_LIMIT = 255
+LANGUAGE_LIMIT = 50
+PAGE_COUNT_LIMIT = 2**31 - 1
+
+
 class BookBase(BaseModel):
-    title: str
-    author: str
-    publisher: str
+    title: str = Field(max_length=TEXT_LIMIT)
+    author: str = Field(max_length=TEXT_LIMIT)
+    publisher: str = Field(max_length=TEXT_LIMIT)
     published_date: date
-    page_count: int
-    language: str
+    page_count: int = Field(ge=-PAGE_COUNT_LIMIT - 1, le=PAGE_COUNT_LIMIT)
+    language: str = Field(max_length=LANGUAGE_LIMIT)
 
 
 class BookCreate(BookBase):
@@ -17,12 +24,28 @@ class BookCreate(BookBase):
 
 
 class BookUpdate(BaseModel):
-    title: str | None = None
+    title: str | None = Field(None, max_length=TEXT_LIMIT)
+    author: str | None = Field(None, max_length=TEXT_LIMIT)
+    publisher: str | None = Field(None, max_length=TEXT_LIMIT)
+    published_date: date | None = None
+    page_count: int | None = Field(None, ge=-PAGE_COUNT_LIMIT - 1, le=PAGE_COUNT_LIMIT)
+    language: str | None = Field(None, max_length=LANGUAGE_LIMIT)
+
+
+class BookFilter(BaseModel):
     author: str | None = None
     publisher: str | None = None
-    published_date: date | None = None
-    page_count: int | None = None
     language: str | None = None
+    published_from: date | None = None
+    published_to: date | None = None
+    min_pages: int | None = None
+    max_pages: int | None = None
+    sort: Literal["created_at", "published_date", "page_count", "title"] = "created_at"
+    order: Literal["asc", "desc"] = "desc"
+
+
+class BookBulkUpdate(BookUpdate):
+    uid: uuid.UUID
 
 
 class BookRead(BookBase):
@@ -30,3 +53,48 @@ class BookRead(BookBase):
     created_at: datetime
     updated_at: datetime
 
+
+class BookPage(BaseModel):
+    items: list[dict[str, Any]]
+    next_cursor: str | None = None
+
+
+class BookChange(BaseModel):
+    uid: uuid.UUID
+    change: Literal["upsert", "delete"]
+    changed_at: datetime
+    # The book as it is now for upserts; absent for deletes
+    book: BookRead | None = None
+
+
+class BookChangePage(BaseModel):
+    items: list[BookChange]
+    # Always set: pass it as `since` to continue from here, now or on the next sync
+    next_cursor: str
+    has_more: bool
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: Any
+
+
+class BookBulkResult(BaseModel):
+    items: list[BookRead] = []
+    errors: list[BulkItemError] = []
+
+
+class BookBulkDeleteResult(BaseModel):
+    deleted: list[uuid.UUID] = []
+    errors: list[BulkItemError] = []
+
+
+class IngestJob(BaseModel):
+    job_id: uuid.UUID
+    status: Literal["queued", "running", "completed"]
+    total: int
+    processed: int = 0
+    inserted: int = 0
+    failed: int = 0
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from src.books.etag import book_etag, validator_headers
+from src.books.schemas import BookRead, BookPage, BookChangePage
+
+# Validates a whole batch of rows into BookRead in a single pydantic-core call
+book_list_adapter = TypeAdapter(list[BookRead])
+
+
+def page_response(page: BookPage, headers: dict[str, str] | None = None) -> ORJSONResponse:
+    """Page items are plain dicts built from result rows, so encode them as-is."""
+    return ORJSONResponse({"items": page.items, "next_cursor": page.next_cursor}, headers=headers)
+
+
+def change_page_response(page: BookChangePage) -> ORJSONResponse:
+    return ORJSONResponse({"items": page.items, "next_cursor": page.next_cursor, "has_more": page.has_more})
+
+
+def book_response(book: Any, status_code: int = 200) -> ORJSONResponse:
+    """A `Book` row dumps to exactly the `BookRead` fields; skip re-validating it."""
+    return ORJSONResponse(
+        book.model_dump(),
+        status_code=status_code,
+        headers=validator_headers(book_etag(book.updated_at), book.updated_at),
+    )
+
+
+def payload_updated_at(payload: bytes) -> datetime:
+    return datetime.fromisoformat(orjson.loads(payload)["updated_at"])
+
+
+def book_json_response(payload: bytes) -> Response:
+    """Cached `BookRead` JSON, with its validators recovered from `updated_at`."""
+    updated_at = payload_updated_at(payload)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers=validator_headers(book_etag(updated_at), updated_at),
+    )
+
+
+def not_modified_response(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
+
+
+def ndjson_lines(rows: list[dict[str, Any]]) -> bytes:
+    return b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows)
@@ -1,16 +1,332 @@
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, desc
+from typing import Any, AsyncIterator, Awaitable, Callable
+from sqlmodel import select, desc, asc
+from sqlalchemy import tuple_, insert, update, delete, values, column, func, cast, any_, bindparam, or_, literal_column, literal, null, union_all
+import sqlalchemy.dialects.postgresql as pg
+from pydantic import BaseModel, ValidationError
+from asyncpg.exceptions import DataError as DriverDataError, IntegrityConstraintViolationError
+from sqlalchemy.exc import DataError, IntegrityError
 from fastapi import HTTPException, status
-from src.books.models import Book
-from src.books.schemas import BookCreate, BookUpdate
+from datetime import datetime, date, timedelta
+from src.books.models import Book, BookTombstone
+from src.books.cache import book_cache
+from src.books.events import notify_book_changes, upsert_change, delete_change
+from src.books.serialization import book_list_adapter, ndjson_lines, payload_updated_at
+from src.books.schemas import (
+    BookCreate,
+    BookUpdate,
+    BookRead,
+    BookPage,
+    BookFilter,
+    BookChangePage,
+    BookBulkUpdate,
+    BookBulkResult,
+    BookBulkDeleteResult,
+    BulkItemError,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from src.db.database import WriteSession, engine
+from src.db.pagination import encode_cursor, decode_cursor, invalid_cursor
 from src.db.redis import add_jti_to_blocklist
+from src.config import Config
 import uuid
+import csv
+import io
+
+BOOK_FIELDS = tuple(BookRead.model_fields)
+# Parsers for the keyset value of each sort the list endpoint allows
+SORT_VALUE_PARSERS = {
+    "created_at": datetime.fromisoformat,
+    "published_date": date.fromisoformat,
+    "page_count": int,
+    "title": str,
+}
+UPDATABLE_FIELDS = tuple(BookUpdate.model_fields)
+# Keeps each UPDATE ... FROM (VALUES ...) well under the 32767 bind parameter limit
+BULK_UPDATE_BATCH_SIZE = 1000
+
+# Errors one bad row causes. COPY goes through the driver directly, so its errors arrive unwrapped
+ROW_ERRORS = (IntegrityError, DataError, IntegrityConstraintViolationError, DriverDataError)
+
+books_table = Book.__table__
+tombstones_table = BookTombstone.__table__
+
+# Generated tsvector column added by migration a0575888b6c0; not mapped on the model so
+# regular selects never load it
+search_vector = literal_column("books.search_vector", type_=pg.TSVECTOR)
+
+
+def optional_datetime(value: str | None) -> datetime | None:
+    return None if value is None else datetime.fromisoformat(value)
+
 
 class BookService:
-    async def get_all_books(self, session: AsyncSession) -> list[Book]:
-        statement = select(Book).order_by(desc(Book.created_at))
+    def _resolve_fields(self, fields: list[str] | None) -> list[str]:
+        if not fields:
+            return list(BOOK_FIELDS)
+
+        unknown = [name for name in fields if name not in BOOK_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}",
+            )
+        return list(dict.fromkeys(fields))
+
+    def _filter_conditions(self, filters: BookFilter) -> list:
+        conditions = []
+        if filters.author is not None:
+            conditions.append(Book.author == filters.author)
+        if filters.publisher is not None:
+            conditions.append(Book.publisher == filters.publisher)
+        if filters.language is not None:
+            conditions.append(Book.language == filters.language)
+        if filters.published_from is not None:
+            conditions.append(Book.published_date >= filters.published_from)
+        if filters.published_to is not None:
+            conditions.append(Book.published_date <= filters.published_to)
+        if filters.min_pages is not None:
+            conditions.append(Book.page_count >= filters.min_pages)
+        if filters.max_pages is not None:
+            conditions.append(Book.page_count <= filters.max_pages)
+        return conditions
+
+    def build_list_statement(
+        self,
+        selected: list[str],
+        limit: int,
+        cursor: str | None = None,
+        filters: BookFilter | None = None,
+    ):
+        filters = filters or BookFilter()
+        sort_column = getattr(Book, filters.sort)
+        direction = desc if filters.order == "desc" else asc
+
+        # The keyset columns are always fetched so the next page can be keyed off the last row
+        columns = [getattr(Book, name) for name in dict.fromkeys([*selected, filters.sort, "uid"])]
+        statement = (
+            select(*columns)
+            .order_by(direction(sort_column), direction(Book.uid))
+            .limit(limit + 1)
+        )
+
+        for condition in self._filter_conditions(filters):
+            statement = statement.where(condition)
+
+        if cursor:
+            sort, order, value, uid = decode_cursor(cursor, str, str, lambda value: value, uuid.UUID)
+            if (sort, order) != (filters.sort, filters.order):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor does not match the requested sort order",
+                )
+            # The value's type depends on the sort, so it is parsed only now; a tampered
+            # cursor must still be a 400, not a 500
+            try:
+                keyset = (SORT_VALUE_PARSERS[sort](value), uid)
+            except (ValueError, TypeError):
+                raise invalid_cursor()
+            if filters.order == "desc":
+                statement = statement.where(tuple_(sort_column, Book.uid) < keyset)
+            else:
+                statement = statement.where(tuple_(sort_column, Book.uid) > keyset)
+
+        return statement
+
+    async def get_all_books(
+        self,
+        session: AsyncSession,
+        limit: int = 50,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+        filters: BookFilter | None = None,
+    ) -> BookPage:
+        filters = filters or BookFilter()
+        selected = self._resolve_fields(fields)
+        statement = self.build_list_statement(selected, limit, cursor, filters)
+
         result = await session.exec(statement)
-        return result.all()
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(filters.sort, filters.order, getattr(last, filters.sort), last.uid)
+
+        items = [{name: getattr(row, name) for name in selected} for row in rows]
+        return BookPage.model_construct(items=items, next_cursor=next_cursor)
+
+    async def get_list_version(
+        self, session: AsyncSession, filters: BookFilter | None = None
+    ) -> tuple[datetime | None, int]:
+        """
+        Latest `updated_at` and row count of the books matching `filters`.
+
+        Any insert, update or delete within the filtered set changes one of the two,
+        so together they validate every page of a listing without reading its rows.
+        """
+        statement = select(func.max(Book.updated_at), func.count()).select_from(Book)
+        for condition in self._filter_conditions(filters or BookFilter()):
+            statement = statement.where(condition)
+        result = await session.exec(statement)
+        return tuple(result.one())
+
+    async def get_changes(self, session: AsyncSession, since: str | None = None, limit: int = 500) -> BookChangePage:
+        """
+        Books created, updated or deleted after the `since` cursor, oldest first.
+
+        Only changes older than the settle window are served, and once a client has
+        caught up its cursor moves to the window's edge, so a write committed late
+        with an earlier `updated_at` is never skipped.
+
+        Without `since` the feed starts from the oldest book. Until that initial sync
+        catches up, its cursors also carry the time it started: only books deleted
+        since then are sent as tombstones, as a fresh client has nothing else to drop,
+        and it is that time, not the possibly years-old position, that must be within
+        tombstone retention.
+        """
+        now = datetime.utcnow()
+        horizon = now - timedelta(seconds=Config.BOOK_CHANGES_SETTLE_SECONDS)
+        position, started = None, horizon
+        if since:
+            changed_at, uid, started = decode_cursor(since, datetime.fromisoformat, uuid.UUID, optional_datetime)
+            position = (changed_at, uid)
+
+        if position is not None and (started or position[0]) < now - timedelta(days=Config.BOOK_TOMBSTONE_RETENTION_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Cursor is older than the deleted books are kept; sync again from the start",
+            )
+
+        upserts = select(
+            Book.uid,
+            Book.updated_at.label("changed_at"),
+            literal(False).label("deleted"),
+            *(getattr(Book, name) for name in BOOK_FIELDS if name != "uid"),
+        ).where(Book.updated_at < horizon)
+        if position is not None:
+            upserts = upserts.where(tuple_(Book.updated_at, Book.uid) > position)
+        branches = [upserts.order_by(Book.updated_at, Book.uid).limit(limit + 1)]
+
+        if position is not None:
+            deletes = (
+                select(
+                    BookTombstone.uid,
+                    BookTombstone.deleted_at.label("changed_at"),
+                    literal(True).label("deleted"),
+                    *(cast(null(), books_table.c[name].type).label(name) for name in BOOK_FIELDS if name != "uid"),
+                )
+                .where(BookTombstone.deleted_at < horizon)
+                .where(tuple_(BookTombstone.deleted_at, BookTombstone.uid) > position)
+            )
+            if started is not None:
+                deletes = deletes.where(BookTombstone.deleted_at >= started)
+            branches.append(deletes.order_by(BookTombstone.deleted_at, BookTombstone.uid).limit(limit + 1))
+
+        # Each branch is a bounded range scan of its (timestamp, uid) index
+        changes = union_all(*(select(branch.subquery()) for branch in branches)).subquery()
+        # Columns spelled out: sqlmodel's select() of a single subquery yields scalars, not rows
+        statement = select(*changes.c).order_by(changes.c.changed_at, changes.c.uid).limit(limit + 1)
+
+        result = await session.exec(statement)
+        rows = result.all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if has_more:
+            next_cursor = encode_cursor(rows[-1].changed_at, rows[-1].uid, started)
+        else:
+            # Everything before the horizon has been read; rows stamped exactly at it come
+            # next time, and from then on the cursor tracks a caught-up client
+            next_cursor = encode_cursor(horizon, uuid.UUID(int=0), None)
+
+        items = [
+            {"uid": row.uid, "change": "delete", "changed_at": row.changed_at, "book": None}
+            if row.deleted else
+            {"uid": row.uid, "change": "upsert", "changed_at": row.changed_at, "book": {name: getattr(row, name) for name in BOOK_FIELDS}}
+            for row in rows
+        ]
+        return BookChangePage.model_construct(items=items, next_cursor=next_cursor, has_more=has_more)
+
+    async def search_books(
+        self,
+        session: AsyncSession,
+        q: str,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> BookPage:
+        """
+        Ranked search over title/author/publisher. Full-text matches use the weighted
+        tsvector; trigram similarity on title and author catches typos the tsquery misses.
+        """
+        ts_query = func.websearch_to_tsquery("simple", q)
+        rank = (
+            func.ts_rank_cd(search_vector, ts_query)
+            + func.greatest(func.similarity(Book.title, q), func.similarity(Book.author, q))
+        ).label("rank")
+
+        columns = [getattr(Book, name) for name in BOOK_FIELDS]
+        statement = (
+            select(*columns, rank)
+            .where(or_(
+                search_vector.op("@@")(ts_query),
+                Book.title.op("%")(q),
+                Book.author.op("%")(q),
+            ))
+            .order_by(desc(rank), desc(Book.uid))
+            .limit(limit + 1)
+        )
+        if cursor:
+            last_rank, uid = decode_cursor(cursor, float, uuid.UUID)
+            statement = statement.where(tuple_(rank, Book.uid) < (last_rank, uid))
+
+        result = await session.exec(statement)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].uid)
+
+        items = [{name: getattr(row, name) for name in (*BOOK_FIELDS, "rank")} for row in rows]
+        return BookPage.model_construct(items=items, next_cursor=next_cursor)
+
+    async def export_books(self, fmt: str, chunk_size: int, bind: AsyncEngine = engine) -> AsyncIterator[bytes]:
+        """
+        Stream the whole table as NDJSON or CSV, one encoded chunk per `chunk_size` rows.
+
+        Runs on its own session because the stream outlives the request's dependencies,
+        and reads through a server-side cursor so memory stays flat regardless of table size.
+        """
+        columns = [getattr(Book, name) for name in BOOK_FIELDS]
+        statement = (
+            select(*columns)
+            .order_by(desc(Book.created_at), desc(Book.uid))
+            .execution_options(yield_per=chunk_size)
+        )
+
+        if fmt == "csv":
+            yield self._csv_chunk([BOOK_FIELDS])
+
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            result = await session.stream(statement)
+            async for rows in result.partitions(chunk_size):
+                # Rows carry exactly the BookRead fields, already typed by the driver
+                if fmt == "csv":
+                    yield self._csv_chunk(
+                        [[self._csv_value(value) for value in row] for row in rows]
+                    )
+                else:
+                    yield ndjson_lines([row._asdict() for row in rows])
+
+    def _csv_value(self, value: Any) -> Any:
+        return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+    def _csv_chunk(self, rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
 
     async def get_book_by_id(self, session: AsyncSession, book_id: uuid.UUID) -> Book:
         statement = select(Book).where(Book.uid == book_id)
@@ -22,38 +338,302 @@ class BookService:
         
         return book
 
+    async def get_book_version(self, session: AsyncSession, book_id: uuid.UUID) -> datetime:
+        """`updated_at` of a book, from its cached payload when there is one, else from the index."""
+        cached = await book_cache.peek(book_id)
+        if cached is not None:
+            return payload_updated_at(cached)
+
+        result = await session.exec(select(Book.updated_at).where(Book.uid == book_id))
+        updated_at = result.one_or_none()
+        if updated_at is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+        return updated_at
+
+    async def get_book_json(self, book_id: uuid.UUID) -> bytes:
+        """
+        Serialized `BookRead` for a single book, served from the cache when possible.
+
+        Misses are loaded from the primary: a lagging replica could return the version
+        a write has just invalidated, and the cache would then serve it until it expires.
+        """
+        async def load() -> bytes:
+            async with WriteSession() as session:
+                book = await self.get_book_by_id(session, book_id)
+            return BookRead.model_validate(book, from_attributes=True).model_dump_json().encode()
+
+        return await book_cache.get_or_load(book_id, load)
+
     async def create_book(self, session: AsyncSession, book_data: BookCreate) -> Book:
         book_dict = book_data.model_dump()
         new_book = Book(**book_dict)
         session.add(new_book)
+        await session.flush()
+        await notify_book_changes(session, [upsert_change(new_book.model_dump())])
         await session.commit()
         await session.refresh(new_book)
         return new_book
 
-    async def update_book(self, session: AsyncSession, book_id: uuid.UUID, book_data: BookUpdate) -> Book:
-        statement = select(Book).where(Book.uid == book_id)
+    async def update_book(
+        self,
+        session: AsyncSession,
+        book_id: uuid.UUID,
+        book_data: BookUpdate,
+        expected: list[datetime] | None = None,
+    ) -> Book:
+        # An empty patch still locks and returns the row, without bumping updated_at
+        changes = book_data.model_dump(exclude_unset=True) or {"updated_at": Book.updated_at}
+        statement = self._versioned(update(Book), book_id, expected).values(**changes).returning(Book)
         result = await session.exec(statement)
-        book = result.one_or_none()
-
-        if not book:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+        book = result.scalar_one_or_none()
 
-        for key, value in book_data.model_dump(exclude_unset=True).items():
-            setattr(book, key, value)
+        if book is None:
+            await self._raise_missing(session, book_id, expected)
 
+        if book_data.model_fields_set:
+            await notify_book_changes(session, [upsert_change(book.model_dump())])
         await session.commit()
-        await session.refresh(book)
+        await book_cache.invalidate(book_id)
         return book
 
 
-    async def delete_book(self, session: AsyncSession, book_id: uuid.UUID):
-        statement = select(Book).where(Book.uid == book_id)
+    async def delete_book(self, session: AsyncSession, book_id: uuid.UUID, expected: list[datetime] | None = None):
+        deleted_at = datetime.utcnow()
+        statement = (
+            self._versioned(delete(Book), book_id, expected)
+            .returning(Book.uid, Book.author, Book.language)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(self._tombstoned(statement, deleted_at))
+        deleted = result.one_or_none()
+
+        if deleted is None:
+            await self._raise_missing(session, book_id, expected)
+
+        await notify_book_changes(session, [delete_change(deleted.uid, deleted.language, deleted.author, deleted_at)])
+        await self._purge_tombstones(session)
+        await session.commit()
+        await book_cache.invalidate(book_id)
+        return status.HTTP_200_OK
+
+    def _tombstoned(self, statement, deleted_at: datetime):
+        """
+        Wraps a DELETE ... RETURNING uid, author, language so the deleted books leave
+        tombstones in the same statement, which still returns the deleted rows.
+        """
+        deleted = statement.cte("deleted")
+        insert_tombstones = pg.insert(tombstones_table).from_select(
+            ["uid", "deleted_at"],
+            select(deleted.c.uid, literal(deleted_at, pg.TIMESTAMP)),
+        )
+        # A uid can be reused by a later insert and deleted again
+        insert_tombstones = insert_tombstones.on_conflict_do_update(
+            index_elements=[tombstones_table.c.uid],
+            set_={"deleted_at": insert_tombstones.excluded.deleted_at},
+        )
+        return select(deleted.c.uid, deleted.c.author, deleted.c.language).add_cte(insert_tombstones.cte("tombstones"))
+
+    async def _purge_tombstones(self, session: AsyncSession) -> None:
+        cutoff = datetime.utcnow() - timedelta(days=Config.BOOK_TOMBSTONE_RETENTION_DAYS)
+        await session.exec(delete(tombstones_table).where(tombstones_table.c.deleted_at < cutoff))
+
+    def _versioned(self, statement, book_id: uuid.UUID, expected: list[datetime] | None):
+        statement = statement.where(Book.uid == book_id)
+        if expected is not None:
+            statement = statement.where(Book.updated_at.in_(expected))
+        return statement
+
+    async def _raise_missing(self, session: AsyncSession, book_id: uuid.UUID, expected: list[datetime] | None):
+        """A conditional write touched no row: tell a stale version apart from a missing book."""
+        if expected is not None:
+            result = await session.exec(select(Book.uid).where(Book.uid == book_id))
+            if result.one_or_none() is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_412_PRECONDITION_FAILED,
+                    detail="Book has been modified since it was read",
+                )
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+
+    def _validate_items(
+        self, items: list[Any], model: type[BaseModel]
+    ) -> tuple[list[tuple[int, BaseModel]], list[BulkItemError]]:
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, model.model_validate(item)))
+            except ValidationError as e:
+                errors.append(
+                    BulkItemError(
+                        index=index,
+                        detail=e.errors(include_url=False, include_context=False, include_input=False),
+                    )
+                )
+        return valid, errors
+
+    async def _isolated(
+        self,
+        session: AsyncSession,
+        items: list[tuple[int, Any]],
+        apply: Callable[[list[Any]], Awaitable[list[Any]]],
+    ) -> tuple[list[Any], list[BulkItemError]]:
+        """
+        Apply a write to all items under one savepoint; if a row breaks a constraint,
+        redo them one savepoint each so only the offending items fail.
+        """
+        try:
+            async with session.begin_nested():
+                return await apply([item for _, item in items]), []
+        except ROW_ERRORS:
+            pass
+
+        done, errors = [], []
+        for index, item in items:
+            try:
+                async with session.begin_nested():
+                    done.extend(await apply([item]))
+            except ROW_ERRORS as e:
+                errors.append(BulkItemError(index=index, detail=str(getattr(e, "orig", e))))
+        return done, errors
+
+    async def _insert_books(self, session: AsyncSession, rows: list[dict[str, Any]]) -> list[Any]:
+        # executemany + RETURNING is sent as batched multi-row INSERT ... VALUES ... RETURNING
+        statement = insert(books_table).returning(*books_table.c, sort_by_parameter_order=True)
+        result = await session.exec(statement, params=rows)
+        return result.all()
+
+    async def bulk_create_books(self, session: AsyncSession, items: list[Any], use_copy: bool = False) -> BookBulkResult:
+        valid, errors = self._validate_items(items, BookCreate)
+        if not valid:
+            return BookBulkResult(errors=errors)
+
+        rows = [(index, book.model_dump()) for index, book in valid]
+        write = (lambda batch: self._copy_books(session, batch)) if use_copy else (lambda batch: self._insert_books(session, batch))
+        created, failed = await self._isolated(session, rows, write)
+        errors = sorted(errors + failed, key=lambda error: error.index)
+
+        created = book_list_adapter.validate_python(created, from_attributes=True)
+        await notify_book_changes(session, [upsert_change(book.model_dump()) for book in created])
+        await session.commit()
+
+        return BookBulkResult(items=created, errors=errors)
+
+    async def _copy_books(self, session: AsyncSession, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        COPY fast path for very large inserts. COPY cannot return rows, so keys and
+        timestamps are generated here instead of by the column defaults.
+        """
+        now = datetime.utcnow()
+        columns = ["uid", *BookCreate.model_fields, "created_at", "updated_at"]
+        records = [
+            (uuid.uuid4(), *(row[name] for name in BookCreate.model_fields), now, now)
+            for row in rows
+        ]
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            books_table.name, records=records, columns=columns
+        )
+
+        return [dict(zip(columns, record)) for record in records]
+
+    async def insert_ingested_books(self, session: AsyncSession, rows: list[dict[str, Any]]) -> set[uuid.UUID]:
+        """
+        Insert ingest rows, which carry deterministic uids, skipping any already
+        present so a redelivered batch is applied once. Returns the uids inserted.
+        """
+        statement = (
+            pg.insert(books_table)
+            .on_conflict_do_nothing(index_elements=[books_table.c.uid])
+            .returning(books_table.c.uid)
+        )
+        result = await session.exec(statement, params=rows)
+        return set(result.scalars().all())
+
+    async def bulk_update_books(self, session: AsyncSession, items: list[Any]) -> BookBulkResult:
+        valid, errors = self._validate_items(items, BookBulkUpdate)
+
+        # UPDATE ... FROM touches a row once, so only the last patch per uid is applied
+        latest: dict[uuid.UUID, tuple[int, BookBulkUpdate]] = {}
+        for index, book in valid:
+            if book.uid in latest:
+                errors.append(BulkItemError(index=latest[book.uid][0], detail="Superseded by a later item with the same uid"))
+            latest[book.uid] = (index, book)
+
+        pending = list(latest.values())
+        updated = []
+        for start in range(0, len(pending), BULK_UPDATE_BATCH_SIZE):
+            rows, failed = await self._isolated(
+                session,
+                pending[start:start + BULK_UPDATE_BATCH_SIZE],
+                lambda batch: self._update_books(session, batch),
+            )
+            updated.extend(rows)
+            errors.extend(failed)
+
+        updated = book_list_adapter.validate_python(updated, from_attributes=True)
+        await notify_book_changes(session, [upsert_change(book.model_dump()) for book in updated])
+        await session.commit()
+        await book_cache.invalidate(*(book.uid for book in updated))
+
+        failed = {error.index for error in errors}
+        found = {book.uid for book in updated}
+        errors.extend(
+            BulkItemError(index=index, detail="Book not found")
+            for index, book in pending
+            if book.uid not in found and index not in failed
+        )
+        errors.sort(key=lambda error: error.index)
+
+        return BookBulkResult(items=updated, errors=errors)
+
+    async def _update_books(self, session: AsyncSession, books: list[BookBulkUpdate]) -> list[Any]:
+        patch = values(
+            column("uid", books_table.c.uid.type),
+            *(column(name, books_table.c[name].type) for name in UPDATABLE_FIELDS),
+            name="patch",
+        ).data([
+            (book.uid, *(getattr(book, name) for name in UPDATABLE_FIELDS))
+            for book in books
+        ])
+
+        # Unset fields arrive as NULL and fall back to the current value. The cast keeps
+        # Postgres from typing an all-NULL VALUES column as text.
+        statement = (
+            update(books_table)
+            .where(books_table.c.uid == patch.c.uid)
+            .values({
+                name: func.coalesce(cast(patch.c[name], books_table.c[name].type), books_table.c[name])
+                for name in UPDATABLE_FIELDS
+            })
+            .returning(*books_table.c)
+        )
         result = await session.exec(statement)
-        book = result.one_or_none()
+        return result.all()
 
-        if not book:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Book not found")
+    async def bulk_delete_books(self, session: AsyncSession, uids: list[uuid.UUID]) -> BookBulkDeleteResult:
+        statement = (
+            delete(books_table)
+            .where(books_table.c.uid == any_(bindparam("uids", type_=pg.ARRAY(books_table.c.uid.type))))
+            .returning(books_table.c.uid, books_table.c.author, books_table.c.language)
+        )
+        deleted_at = datetime.utcnow()
+        result = await session.exec(self._tombstoned(statement, deleted_at), params={"uids": list(set(uids))})
+        rows = result.all()
+        deleted = {row.uid for row in rows}
 
-        await session.delete(book)
+        await notify_book_changes(
+            session, [delete_change(row.uid, row.language, row.author, deleted_at) for row in rows]
+        )
+        await self._purge_tombstones(session)
         await session.commit()
-        return status.HTTP_200_OK
\ No newline at end of file
+        await book_cache.invalidate(*deleted)
+
+        return BookBulkDeleteResult(
+            deleted=[uid for uid in dict.fromkeys(uids) if uid in deleted],
+            errors=[
+                BulkItemError(index=index, detail="Book not found")
+                for index, uid in enumerate(uids)
+                if uid not in deleted
+            ],
+        )
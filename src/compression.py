@@ -0,0 +1,262 @@
+import time
+import zlib
+from typing import Callable
+
+from prometheus_client import Counter
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_BYTES = Counter(
+    "http_compression_bytes_total",
+    "Response bytes before and after compression, by encoding",
+    ["encoding", "stage"],
+)
+COMPRESSION_SKIPPED = Counter(
+    "http_compression_skipped_total",
+    "Compressible responses sent uncompressed, by reason",
+    ["reason"],
+)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+# Event streams are long-lived and fanned out to many clients; compressing each copy costs too much
+INCOMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+class GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so every streamed chunk reaches the client as soon as it is produced
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def varies_by_encoding(start: Message) -> bool:
+    """
+    Whether a response's body depends on Accept-Encoding: any compressible one, sent
+    compressed or not, and 304s, which stand in for either.
+    """
+    content_type = Headers(raw=start["headers"]).get("content-type", "")
+    return start["status"] == 304 or (
+        content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(INCOMPRESSIBLE_TYPES)
+    )
+
+
+def available_encodings(gzip_level: int, brotli_quality: int, zstd_level: int) -> dict[str, Callable[[], object]]:
+    """Encodings this process can produce, most preferred first."""
+    encodings: dict[str, Callable[[], object]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = lambda: ZstdCompressor(zstd_level)
+    if brotli is not None:
+        encodings["br"] = lambda: BrotliCompressor(brotli_quality)
+    encodings["gzip"] = lambda: GzipCompressor(gzip_level)
+    return encodings
+
+
+def negotiate(accept_encoding: str, offered: list[str]) -> str | None:
+    """Best of `offered` by the client's q-values, ties going to the server's preference."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = weight
+
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in offered:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CpuBudget:
+    """
+    Caps the share of one core spent compressing, measured over a rolling window.
+    Responses starting while the budget is spent go out uncompressed.
+    """
+
+    def __init__(self, fraction: float, window: float = 1.0) -> None:
+        self.allowance = fraction * window
+        self.window = window
+        self._window_started = time.monotonic()
+        self._spent = 0.0
+
+    def available(self) -> bool:
+        now = time.monotonic()
+        if now - self._window_started >= self.window:
+            self._window_started = now
+            self._spent = 0.0
+        return self._spent < self.allowance
+
+    def spend(self, seconds: float) -> None:
+        self._spent += seconds
+
+
+class CompressionMiddleware:
+    """
+    Compresses JSON, NDJSON and text responses with zstd, brotli or gzip, whichever
+    the client accepts and this process supports.
+
+    Buffered bodies below `minimum_size` are left alone. Streaming responses are
+    compressed chunk by chunk, each flushed so clients and HTTP/2 proxies see data
+    as soon as the app produces it rather than when the compressor's window fills.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cpu_budget: float = 0.5,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.budget = CpuBudget(cpu_budget)
+        self.encodings = available_encodings(gzip_level, brotli_quality, zstd_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encodings))
+        if encoding is None:
+            # Nothing to compress with, but caches must still not serve this to clients that could get more
+            async def send_with_vary(message: Message) -> None:
+                if message["type"] == "http.response.start" and varies_by_encoding(message):
+                    MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        await CompressionResponder(self, encoding)(scope, receive, send)
+
+
+class CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.start: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.middleware.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether compressing is worth it
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            reason = self._skip_reason(body, more_body)
+            if reason is not None:
+                if reason != "not_compressible":
+                    COMPRESSION_SKIPPED.labels(reason).inc()
+                if varies_by_encoding(self.start):
+                    MutableHeaders(scope=self.start).add_vary_header("Accept-Encoding")
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = self.middleware.encodings[self.encoding]()
+            headers = MutableHeaders(scope=self.start)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            etag = headers.get("ETag")
+            if etag is not None and not etag.startswith("W/"):
+                # The encoded bytes differ from the identity ones, so they can't share a strong
+                # validator; If-None-Match compares weakly and still matches
+                headers["ETag"] = "W/" + etag
+            if not more_body:
+                compressed = self._compress(body, final=True)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(self.start)
+
+        compressed = self._compress(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    def _skip_reason(self, body: bytes, more_body: bool) -> str | None:
+        headers = Headers(raw=self.start["headers"])
+        content_type = headers.get("content-type", "")
+        if (
+            "content-encoding" in headers
+            or self.start["status"] in (204, 304)
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+            or content_type.startswith(INCOMPRESSIBLE_TYPES)
+        ):
+            return "not_compressible"
+        if not more_body and len(body) < self.middleware.minimum_size:
+            return "below_minimum_size"
+        if not self.middleware.budget.available():
+            return "cpu_budget"
+        return None
+
+    def _compress(self, data: bytes, final: bool) -> bytes:
+        started = time.perf_counter()
+        compressed = self.compressor.finish(data) if final else self.compressor.compress(data)
+        self.middleware.budget.spend(time.perf_counter() - started)
+        COMPRESSION_BYTES.labels(self.encoding, "in").inc(len(data))
+        COMPRESSION_BYTES.labels(self.encoding, "out").inc(len(compressed))
+        return compressed
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -7,6 +8,105 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
 
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # asyncpg prepared statement cache, per connection
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Disables prepared statement caching for PgBouncer in transaction pooling mode
+    DB_PGBOUNCER_MODE: bool = False
+    # At startup: "verify" checks the database is at the Alembic head, "create_all" creates
+    # missing tables directly (local development only), "off" does neither
+    DB_SCHEMA_CHECK: Literal["verify", "create_all", "off"] = "verify"
+    # Pool connections opened during startup, capped at DB_POOL_SIZE
+    DB_POOL_WARM_SIZE: int = 4
+
+    # Read replicas for GET routes and user lookups, as a JSON list of URLs; empty reads from the primary
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_BALANCING: Literal["round_robin", "least_connections"] = "round_robin"
+    DB_REPLICA_HEALTH_INTERVAL: float = 5.0
+    DB_REPLICA_HEALTH_TIMEOUT: float = 2.0
+    # Replicas replaying WAL further behind than this are taken out of rotation
+    DB_REPLICA_MAX_LAG: float = 5.0
+    # After a request that committed, the same client reads from the primary for this long
+    DB_READ_YOUR_WRITES_WINDOW: float = 5.0
+
+    BOOK_EXPORT_CHUNK_SIZE: int = 1000
+    BOOK_BULK_MAX_ITEMS: int = 50000
+    BOOK_CACHE_TTL: int = 300
+    # Reject book PATCH/DELETE without an If-Match header instead of applying them unconditionally
+    BOOK_REQUIRE_IF_MATCH: bool = False
+    # The change feed only serves changes older than this, so writes still in flight or
+    # not yet replayed on a replica can't land behind a cursor; keep it above DB_REPLICA_MAX_LAG
+    BOOK_CHANGES_SETTLE_SECONDS: float = 10.0
+    # Tombstones of deleted books are purged after this; older change feed cursors get a 410
+    BOOK_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Push book changes over SSE/WebSocket from a LISTEN connection per worker. LISTEN needs
+    # a session-level connection, so point BOOK_EVENTS_LISTEN_URL past PgBouncer in transaction mode
+    BOOK_EVENTS_ENABLED: bool = True
+    BOOK_EVENTS_LISTEN_URL: str | None = None
+    # Events buffered per subscriber; one that falls this far behind is disconnected
+    BOOK_EVENTS_QUEUE_SIZE: int = 256
+    BOOK_EVENTS_MAX_SUBSCRIBERS: int = 10000
+    BOOK_EVENTS_KEEPALIVE: float = 15.0
+
+    # Run an ingest consumer inside each app worker; disable when running `python -m src.books.ingest` instead
+    INGEST_WORKER_ENABLED: bool = True
+    INGEST_MAX_ROWS: int = 1_000_000
+    # Request body cap, checked while it streams in; a JSON array body is buffered whole before parsing
+    INGEST_MAX_BODY_BYTES: int = 256 * 1024 * 1024
+    # Rows per stream entry, and rows per multi-row INSERT on the consumer side
+    INGEST_CHUNK_ROWS: int = 500
+    INGEST_BATCH_ROWS: int = 2000
+    INGEST_JOB_TTL: int = 7 * 24 * 3600
+    # Entries left unacknowledged this long by a dead consumer are claimed by another
+    INGEST_CLAIM_IDLE_MS: int = 60_000
+
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_SHARED: bool = False
+    # Authorize from the access token's role claim alone; a role change then takes
+    # effect once the user's current access token expires
+    AUTH_ROLE_FROM_TOKEN: bool = False
+    TOKEN_CACHE_MAX_SIZE: int = 50000
+    # Seconds a page of the admin user listing may be served from Redis; 0 disables the cache
+    USER_PAGE_CACHE_TTL: int = 0
+
+    # Token buckets on the auth endpoints as (burst, sustained requests per minute),
+    # e.g. RATE_LIMIT_LOGIN_PER_EMAIL='[5, 2]'
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_IP: tuple[int, float] = (20, 10)
+    RATE_LIMIT_LOGIN_PER_EMAIL: tuple[int, float] = (5, 2)
+    RATE_LIMIT_SIGNUP_PER_IP: tuple[int, float] = (5, 1)
+    RATE_LIMIT_REFRESH_PER_IP: tuple[int, float] = (60, 30)
+    RATE_LIMIT_REFRESH_PER_USER: tuple[int, float] = (10, 2)
+    # Key client IPs by the first X-Forwarded-For hop; only behind a proxy that sets it
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    # Rejected clients remembered per worker so their retries skip Redis
+    RATE_LIMIT_DENY_CACHE_SIZE: int = 10000
+
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # Share of one core per worker that may be spent compressing; beyond it responses go out uncompressed
+    COMPRESSION_CPU_BUDGET: float = 0.5
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    INSTRUMENTATION_ENABLED: bool = False
+    # Value clients must send as X-Profile-Token to get a profile back; unset disables it
+    PROFILING_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = "profiles"
+
     model_config = SettingsConfigDict(
         env_file=".env", 
         extra="ignore"
@@ -1,25 +1,103 @@
+import time
+import uuid
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, async_sessionmaker
 from src.config import Config
+from src.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_HOLD_SECONDS,
+    DB_POOL_WAIT_SECONDS,
+    DB_POOL_OVERFLOW,
+    DB_POOL_TIMEOUTS,
+    DB_STATEMENTS,
+)
 
 
-engine: AsyncEngine = create_async_engine(
-    Config.DATABASE_URL,
-    echo=True
-)
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    metrics_label = "primary"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(self.metrics_label).observe(time.perf_counter() - start)
+
+
+def _connect_args() -> dict:
+    if Config.DB_PGBOUNCER_MODE:
+        # PgBouncer in transaction mode can hand each statement to a different server
+        # connection, so named prepared statements must be neither cached nor reused
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE}
+
+
+def instrument_engine(engine: AsyncEngine, label: str) -> None:
+    # Pool events registered on the engine survive the pool being recreated by dispose()
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        if engine.sync_engine.pool.overflow() > 0:
+            DB_POOL_OVERFLOW.labels(label).inc()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.labels(label).inc()
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.labels(label).dec()
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            DB_POOL_HOLD_SECONDS.labels(label).observe(time.perf_counter() - checked_out_at)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        DB_STATEMENTS.labels(label).inc()
+
+
+def create_pooled_engine(url: str, poolclass: type[InstrumentedPool] = InstrumentedPool) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=Config.DB_ECHO,
+        poolclass=poolclass,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+    instrument_engine(engine, poolclass.metrics_label)
+    return engine
+
+
+engine: AsyncEngine = create_pooled_engine(Config.DATABASE_URL)
 
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
-async def get_session() -> AsyncSession:
+WriteSession = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
-    Session = async_sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
 
-    async with Session() as session:
-        yield session
\ No newline at end of file
+async def get_session() -> AsyncSession:
+    """
+    Primary session for the request. No connection is checked out until the first
+    statement; routes depend on it with scope="function" so it is returned to the pool
+    as soon as the endpoint returns, before the response is sent.
+    """
+    async with WriteSession() as session:
+        yield session
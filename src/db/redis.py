@@ -1,16 +1,114 @@
+import json
+import time
 from redis import asyncio as redis
 from src.config import Config
 
-JTI_EXPIRY = 360
+# Revoked token ids scored by their token's exp, so entries are dropped once the token would have expired anyway
+REVOKED_JTIS_KEY = "auth:revoked_jtis"
+# User ids scored by the time before which all of their tokens are revoked
+NOT_BEFORE_KEY = "auth:not_before"
 
-token_blocklist = redis.from_url(
-    f"redis://{Config.REDIS_HOST}:{Config.REDIS_PORT}/0",
+# Pub/sub channel workers listen on to keep their local auth caches coherent
+AUTH_EVENTS_CHANNEL = "auth:events"
+
+REDIS_URL = f"redis://{Config.REDIS_HOST}:{Config.REDIS_PORT}/0"
+
+redis_client = redis.from_url(
+    REDIS_URL,
     decode_responses=True,
 )
 
-async def add_jti_to_blocklist(jti: str) -> None:
-    await token_blocklist.set(jti, "", ex=JTI_EXPIRY)
+# Separate pool for payloads that are served to clients as-is, without decoding
+cache_client = redis.from_url(REDIS_URL)
+
+# Token buckets, one hash per key. ARGV holds capacity and refill rate (tokens per ms)
+# for each key in turn. A token is taken from every bucket or, if any is empty, from
+# none; the reply is 1 or 0 followed by each bucket's wait in ms until it has a token.
+TOKEN_BUCKET_LUA = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tokens, waits, allowed = {}, {}, 1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or capacity
+    local elapsed = math.max(0, now - (tonumber(state[2]) or now))
+    tokens[i] = math.min(capacity, available + elapsed * rate)
+    waits[i] = 0
+    if tokens[i] < 1 then
+        waits[i] = math.ceil((1 - tokens[i]) / rate)
+        allowed = 0
+    end
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tostring(tokens[i] - allowed), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate))
+end
+return {allowed, unpack(waits)}
+"""
+token_bucket = redis_client.register_script(TOKEN_BUCKET_LUA)
+
+async def take_tokens(buckets: dict[str, tuple[int, float]]) -> tuple[bool, list[float]]:
+    """
+    Takes one token from each bucket, keyed by Redis key with (capacity, refills per second),
+    atomically. Returns whether all had one and each bucket's seconds until it has one.
+    """
+    args = []
+    for capacity, per_second in buckets.values():
+        args += [capacity, per_second / 1000]
+    allowed, *waits = await token_bucket(keys=list(buckets), args=args)
+    return bool(allowed), [wait / 1000 for wait in waits]
+
+# Writes a cache entry only if its generation key still holds ARGV[1], the value read
+# before the entry was loaded; an invalidation since then bumped it, and the load is stale
+CACHE_FILL_LUA = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+cache_fill = cache_client.register_script(CACHE_FILL_LUA)
+
+async def fill_if_current(key: str, generation_key: str, generation: bytes | None, payload: bytes, ttl: int) -> bool:
+    """Caches `payload` under `key` unless `generation_key` moved past `generation`; returns whether it did."""
+    return bool(await cache_fill(keys=[key, generation_key], args=[generation or b"0", payload, ttl]))
+
+async def add_jti_to_blocklist(jti: str, expires_at: float) -> None:
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zadd(REVOKED_JTIS_KEY, {jti: expires_at})
+        pipe.zremrangebyscore(REVOKED_JTIS_KEY, "-inf", time.time())
+        pipe.publish(AUTH_EVENTS_CHANNEL, json.dumps({"kind": "jti", "id": jti, "exp": expires_at}))
+        await pipe.execute()
+
+async def revoke_user_tokens(user_id: str, max_token_lifetime: float) -> float:
+    """Revokes every token issued to the user so far; returns the new not-before time."""
+    not_before = time.time()
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zadd(NOT_BEFORE_KEY, {user_id: not_before}, gt=True)
+        # Tokens issued before this are expired whatever their user's not-before says
+        pipe.zremrangebyscore(NOT_BEFORE_KEY, "-inf", not_before - max_token_lifetime)
+        pipe.publish(AUTH_EVENTS_CHANNEL, json.dumps({"kind": "not_before", "id": user_id, "at": not_before}))
+        await pipe.execute()
+    return not_before
+
+async def publish_auth_event(kind: str, id: str) -> None:
+    await redis_client.publish(AUTH_EVENTS_CHANNEL, json.dumps({"kind": kind, "id": id}))
+
+async def token_revoked(jti: str, user_id: str, issued_at: float) -> bool:
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zscore(REVOKED_JTIS_KEY, jti)
+        pipe.zscore(NOT_BEFORE_KEY, user_id)
+        expires_at, not_before = await pipe.execute()
+    return (expires_at is not None and expires_at > time.time()) or (not_before is not None and issued_at < not_before)
 
-async def token_in_blocklist(jti: str) -> bool:
-    value = await token_blocklist.get(jti)
-    return value is not None
+async def load_revocations() -> tuple[dict[str, float], dict[str, float]]:
+    """Revoked token ids with their exp, and users with their not-before time."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.zrangebyscore(REVOKED_JTIS_KEY, time.time(), "+inf", withscores=True)
+        pipe.zrange(NOT_BEFORE_KEY, 0, -1, withscores=True)
+        revoked, not_before = await pipe.execute()
+    return dict(revoked), dict(not_before)
@@ -0,0 +1,196 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette.datastructures import MutableHeaders
+
+from src.config import Config
+from src.db.database import InstrumentedPool, create_pooled_engine, engine
+from src.metrics import DB_REPLICA_HEALTHY, DB_REPLICA_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_COOKIE = "bookly_rw"
+
+# Zero when the replica has replayed everything it received, so an idle primary doesn't read as lag
+REPLICATION_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    def __init__(self, index: int, url: str) -> None:
+        self.label = f"replica{index}"
+        poolclass = type(f"ReplicaPool{index}", (InstrumentedPool,), {"metrics_label": self.label})
+        self.engine = create_pooled_engine(url, poolclass)
+        self.healthy = True
+        DB_REPLICA_HEALTHY.labels(self.label).set(1)
+
+        @event.listens_for(self.engine.sync_engine, "handle_error")
+        def on_error(context):
+            # Take a replica out of rotation as soon as it drops connections, not at the next check
+            if context.is_disconnect or context.connection is None:
+                self.mark(False)
+
+    def checked_out(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()
+
+    def mark(self, healthy: bool) -> None:
+        if healthy != self.healthy:
+            logger.warning("Read replica %s is %s", self.label, "back in rotation" if healthy else "out of rotation")
+        self.healthy = healthy
+        DB_REPLICA_HEALTHY.labels(self.label).set(int(healthy))
+
+
+class ReadRouter:
+    """
+    Chooses the engine a read-only session binds to.
+
+    Healthy replicas are balanced round-robin or by fewest checked-out connections.
+    A background check takes replicas that are unreachable or lagging by more than
+    `max_lag` out of rotation; with none left, reads fall back to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        urls: list[str],
+        balancing: str,
+        health_interval: float,
+        health_timeout: float,
+        max_lag: float,
+    ) -> None:
+        self.primary = primary
+        self.replicas = [Replica(index, url) for index, url in enumerate(urls)]
+        self.balancing = balancing
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.max_lag = max_lag
+        self._turn = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def pick(self) -> AsyncEngine:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return self.primary
+        if self.balancing == "least_connections":
+            return min(healthy, key=Replica.checked_out).engine
+        return healthy[next(self._turn) % len(healthy)].engine
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.health_timeout):
+                async with replica.engine.connect() as conn:
+                    lag = float(await conn.scalar(REPLICATION_LAG_SQL))
+        except Exception:
+            replica.mark(False)
+            return
+
+        DB_REPLICA_LAG_SECONDS.labels(replica.label).set(lag)
+        replica.mark(lag <= self.max_lag)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            await self.check()
+
+
+read_router = ReadRouter(
+    engine,
+    Config.DB_REPLICA_URLS,
+    balancing=Config.DB_REPLICA_BALANCING,
+    health_interval=Config.DB_REPLICA_HEALTH_INTERVAL,
+    health_timeout=Config.DB_REPLICA_HEALTH_TIMEOUT,
+    max_lag=Config.DB_REPLICA_MAX_LAG,
+)
+
+ReadSession = async_sessionmaker(class_=AsyncSession, expire_on_commit=False, info={"read_only": True})
+
+
+def get_read_engine(request: Request) -> AsyncEngine:
+    """A replica, unless this client committed a write within the read-your-writes window."""
+    until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        if until is not None and float(until) > time.time():
+            return read_router.primary
+    except ValueError:
+        pass
+    return read_router.pick()
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    # Like get_session, lazy and meant to be depended on with scope="function"
+    async with ReadSession(bind=get_read_engine(request)) as session:
+        yield session
+
+
+_commits: ContextVar[list[bool] | None] = ContextVar("request_commits", default=None)
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session: Session) -> None:
+    committed = _commits.get()
+    if committed is not None and not session.info.get("read_only"):
+        committed.append(True)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks a client that just committed a write with a short-lived cookie, which
+    routes its reads to the primary until replicas have caught up.
+    """
+
+    def __init__(self, app: ASGIApp, window: float) -> None:
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        committed: list[bool] = []
+        token = _commits.set(committed)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and committed:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={time.time() + self.window:.3f}; "
+                    f"Max-Age={max(1, round(self.window))}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _commits.reset(token)
@@ -0,0 +1,264 @@
+import asyncio
+import cProfile
+import functools
+import io
+import pstats
+import random
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by route template",
+    ["method", "route", "status"],
+)
+REQUEST_PHASE_DURATION = Histogram(
+    "http_request_phase_seconds",
+    "Time spent in each phase of a request, by route template",
+    ["route", "phase"],
+)
+
+_timings: ContextVar["RequestTimings | None"] = ContextVar("request_timings", default=None)
+
+# Both profilers hook the interpreter for the whole thread, and a second one can't start
+# while another runs, so at most one request per worker is profiled at a time
+_profiling = False
+
+
+class RequestTimings:
+    """Per-request accumulator of time spent in each instrumented phase."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = defaultdict(float)
+        self.endpoint_started: float | None = None
+        self.endpoint_finished: float | None = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] += seconds
+
+    def server_timing(self, total: float) -> str:
+        entries = [f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in self.phases.items()]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def current_timings() -> RequestTimings | None:
+    return _timings.get()
+
+
+@contextmanager
+def span(phase: str):
+    """Attribute the wrapped block to `phase` when the current request is instrumented."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+class TimedRoute(APIRoute):
+    """
+    Splits a route's own time into dependency resolution (including body parsing),
+    the endpoint body and response serialization.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        endpoint = self.dependant.call
+
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args: Any, **kwargs: Any) -> Any:
+            timings = _timings.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+
+            timings.endpoint_started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings.endpoint_finished = time.perf_counter()
+                timings.add("endpoint", timings.endpoint_finished - timings.endpoint_started)
+
+        self.dependant.call = timed_endpoint
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = _timings.get()
+            if timings is None:
+                return await handler(request)
+
+            started = time.perf_counter()
+            response = await handler(request)
+            if timings.endpoint_started is not None:
+                timings.add("dependencies", timings.endpoint_started - started)
+                timings.add("serialize", time.perf_counter() - timings.endpoint_finished)
+            return response
+
+        return timed_handler
+
+
+def instrument_sql(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        timings = _timings.get()
+        if timings is not None:
+            timings.add("sql", time.perf_counter() - started)
+
+
+def instrument_redis(client: Any) -> None:
+    execute_command = client.execute_command
+
+    async def timed_execute_command(*args: Any, **options: Any) -> Any:
+        with span("redis"):
+            return await execute_command(*args, **options)
+
+    client.execute_command = timed_execute_command
+
+
+class InstrumentationMiddleware:
+    """
+    Records per-route phase timings as a Server-Timing header and Prometheus histograms.
+
+    Also captures profiles: a request carrying `X-Profile: pyinstrument|cprofile` and the
+    configured `X-Profile-Token` gets the profile back instead of its normal body, and a
+    `sample_rate` fraction of all requests is profiled into `profile_dir`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profile_token: str | None = None,
+        sample_rate: float = 0.0,
+        profile_dir: str = "profiles",
+    ) -> None:
+        self.app = app
+        self.profile_token = profile_token
+        self.sample_rate = sample_rate
+        self.profile_dir = Path(profile_dir)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        try:
+            requested = self._requested_profiler(scope)
+            if requested and _profiling:
+                busy = JSONResponse(
+                    {"detail": "Another request is being profiled, retry shortly"},
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+                await busy(scope, receive, send_with_timing)
+            elif requested:
+                await self._profile_inline(requested, scope, receive, send)
+            elif self.sample_rate and not _profiling and random.random() < self.sample_rate:
+                await self._profile_sampled(scope, receive, send_with_timing)
+            else:
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            _timings.reset(token)
+            route = scope.get("route")
+            template = route.path if route is not None else "unmatched"
+            REQUEST_DURATION.labels(scope["method"], template, status_code).observe(time.perf_counter() - started)
+            for phase, seconds in timings.phases.items():
+                REQUEST_PHASE_DURATION.labels(template, phase).observe(seconds)
+
+    def _requested_profiler(self, scope: Scope) -> str | None:
+        if not self.profile_token:
+            return None
+        headers = Headers(scope=scope)
+        kind = headers.get("x-profile")
+        if kind in ("pyinstrument", "cprofile") and headers.get("x-profile-token") == self.profile_token:
+            return kind
+        return None
+
+    async def _profile_inline(self, kind: str, scope: Scope, receive: Receive, send: Send) -> None:
+        async def discard(message: Message) -> None:
+            pass
+
+        report, media_type = await self._run_profiled(kind, scope, receive, discard)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", media_type.encode())],
+        })
+        await send({"type": "http.response.body", "body": report.encode()})
+
+    async def _profile_sampled(self, scope: Scope, receive: Receive, send: Send) -> None:
+        report, media_type = await self._run_profiled("pyinstrument", scope, receive, send)
+        suffix = "html" if media_type == "text/html" else "txt"
+        await asyncio.to_thread(self._save_profile, report, suffix)
+
+    def _save_profile(self, report: str, suffix: str) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        (self.profile_dir / f"{int(time.time())}-{uuid.uuid4().hex[:8]}.{suffix}").write_text(report)
+
+    async def _run_profiled(self, kind: str, scope: Scope, receive: Receive, send: Send) -> tuple[str, str]:
+        global _profiling
+        _profiling = True
+        try:
+            return await self._run_profiler(kind, scope, receive, send)
+        finally:
+            _profiling = False
+
+    async def _run_profiler(self, kind: str, scope: Scope, receive: Receive, send: Send) -> tuple[str, str]:
+        if kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                kind = "cprofile"
+            else:
+                profiler = Profiler(async_mode="enabled")
+                profiler.start()
+                try:
+                    await self.app(scope, receive, send)
+                finally:
+                    profiler.stop()
+                return profiler.output_html(), "text/html"
+
+        # cProfile sees every coroutine the event loop runs meanwhile, not only this request
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(60)
+        return output.getvalue(), "text/plain"
@@ -1,8 +1,24 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from src.db import init_db
+from src.startup import prepare
+from src.auth.revocation import auth_events
+from src.auth.utils import password_hasher
+from src.db.replicas import read_router
+from src.books.ingest import ingest_worker
+from src.books.events import book_events
+from src.config import Config
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
+    await prepare()
+    await auth_events.start()
+    if Config.INGEST_WORKER_ENABLED:
+        await ingest_worker.start()
+    if Config.BOOK_EVENTS_ENABLED:
+        await book_events.start()
     yield
+    await book_events.stop()
+    await ingest_worker.stop()
+    await read_router.stop()
+    await auth_events.stop()
+    password_hasher.shutdown()
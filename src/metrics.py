@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+metrics_router = APIRouter()
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["pool"],
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_HOLD_SECONDS = Histogram(
+    "db_pool_hold_seconds",
+    "Time a connection stays checked out before being returned to the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_OVERFLOW = Counter(
+    "db_pool_overflow_connections_total",
+    "Connections opened beyond pool_size",
+    ["pool"],
+)
+DB_STATEMENTS = Counter(
+    "db_statements_total",
+    "SQL statements sent to the database",
+    ["pool"],
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ["pool"],
+)
+
+DB_REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "Whether a read replica is currently in rotation",
+    ["pool"],
+)
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "db_replica_lag_seconds",
+    "Replication replay lag seen by the last health check",
+    ["pool"],
+)
+
+AUTH_RATE_LIMITED = Counter(
+    "auth_rate_limited_total",
+    "Auth requests rejected by the rate limiter, by endpoint and where the rejection was decided",
+    ["scope", "source"],
+)
+
+BOOK_EVENT_SUBSCRIBERS = Gauge(
+    "book_event_subscribers",
+    "SSE and WebSocket clients subscribed to book changes",
+)
+BOOK_EVENTS_DELIVERED = Counter(
+    "book_events_delivered_total",
+    "Book change events queued for subscribers",
+)
+BOOK_EVENT_EVICTIONS = Counter(
+    "book_event_evictions_total",
+    "Subscribers disconnected for falling a full queue behind",
+)
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
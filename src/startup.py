@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.auth.hashing import password_hash
+from src.config import Config
+from src.db.database import engine, init_db
+from src.db.redis import redis_client, cache_client
+from src.db.replicas import read_router
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def alembic_heads() -> set[str]:
+    # Alembic is only needed here, and takes longer to import than the rest of startup
+    from alembic.config import Config as AlembicConfig
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(AlembicConfig(str(ALEMBIC_INI))).get_heads())
+
+
+async def database_revisions(engine: AsyncEngine) -> set[str]:
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        except ProgrammingError:
+            return set()
+        return set(result.scalars())
+
+
+async def verify_schema(engine: AsyncEngine) -> None:
+    """Fail fast unless the database is migrated to exactly the Alembic head, without running DDL."""
+    expected, current = await asyncio.gather(asyncio.to_thread(alembic_heads), database_revisions(engine))
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at {sorted(current) or 'no revision'}, expected Alembic head "
+            f"{sorted(expected)}; run `alembic upgrade head` before starting the app"
+        )
+
+
+async def warm_pool(engine: AsyncEngine, size: int) -> None:
+    """Open `size` pool connections concurrently so the first requests don't pay for the handshakes."""
+    if size <= 0:
+        return
+    # Awaiting connect() checks a connection out; closing returns it to the pool, still open
+    connections = await asyncio.gather(*(engine.connect() for _ in range(size)))
+    await asyncio.gather(*(conn.close() for conn in connections))
+
+
+async def ping_redis() -> None:
+    await asyncio.gather(redis_client.ping(), cache_client.ping())
+
+
+async def prepare() -> None:
+    """Everything the app needs before serving, run concurrently rather than one step after another."""
+    if Config.DB_SCHEMA_CHECK == "create_all":
+        schema = init_db()
+    elif Config.DB_SCHEMA_CHECK == "verify":
+        schema = verify_schema(engine)
+    else:
+        schema = asyncio.sleep(0)
+
+    await asyncio.gather(
+        schema,
+        warm_pool(engine, min(Config.DB_POOL_WARM_SIZE, Config.DB_POOL_SIZE)),
+        ping_redis(),
+        read_router.start(),
+        # Loads argon2 off the event loop while the network round trips are in flight
+        asyncio.to_thread(password_hash),
+    )
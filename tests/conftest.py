@@ -0,0 +1,61 @@
+import asyncio
+import sys
+
+import fakeredis
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.books.models import Book, BookTombstone
+from src.db import redis as redis_module
+
+
+@pytest.fixture
+def run_db():
+    """
+    Runs `test(session)` against a fresh in-memory SQLite database holding the book
+    tables, so statements go through a real driver and come back as real results.
+    Postgres-only SQL still needs compiling against the postgresql dialect instead.
+    """
+    def run(test):
+        async def main():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            # The sqlite3 driver's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+            event.listen(engine.sync_engine, "connect", lambda connection, _: setattr(connection, "isolation_level", None))
+            event.listen(engine.sync_engine, "begin", lambda connection: connection.exec_driver_sql("BEGIN"))
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(SQLModel.metadata.create_all, tables=[Book.__table__, BookTombstone.__table__])
+                async with AsyncSession(engine, expire_on_commit=False) as session:
+                    return await test(session)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """
+    An in-memory Redis, Lua scripts included, swapped in for both clients wherever
+    a `src` module imported them, along with the scripts registered on them.
+    """
+    server = fakeredis.FakeServer()
+    fakes = {
+        "cache_client": fakeredis.FakeAsyncRedis(server=server),
+        "redis_client": fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    }
+    originals = {attr: getattr(redis_module, attr) for attr in fakes}
+    for name, module in list(sys.modules.items()):
+        if name == "src" or name.startswith("src."):
+            for attr, fake in fakes.items():
+                if getattr(module, attr, None) is originals[attr]:
+                    monkeypatch.setattr(module, attr, fake)
+    monkeypatch.setattr(redis_module, "cache_fill", fakes["cache_client"].register_script(redis_module.CACHE_FILL_LUA))
+    monkeypatch.setattr(redis_module, "token_bucket", fakes["redis_client"].register_script(redis_module.TOKEN_BUCKET_LUA))
+    return fakes["cache_client"]
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from src.books.service import BookService
+from src.config import Config
+
+BOOK = {
+    "title": "Parable of the Sower",
+    "author": "Octavia E. Butler",
+    "publisher": "Four Walls Eight Windows",
+    "published_date": "1993-10-01",
+    "page_count": 345,
+    "language": "en",
+}
+
+# Stands in for a constraint Postgres would enforce, failing one row of a multi-row INSERT
+REJECT_TRIGGER = """
+CREATE TRIGGER reject_books BEFORE INSERT ON books WHEN NEW.title = 'rejected'
+BEGIN SELECT RAISE(ABORT, 'rejected by constraint'); END
+"""
+
+
+@pytest.fixture(autouse=True)
+def no_book_events(monkeypatch):
+    # NOTIFY is Postgres-only; its SQL is covered in test_book_events
+    monkeypatch.setattr(Config, "BOOK_EVENTS_ENABLED", False)
+
+
+def test_bulk_create_reports_rows_the_database_rejects_and_keeps_the_rest(run_db):
+    items = [BOOK, {**BOOK, "title": "rejected"}, {**BOOK, "page_count": "many"}, {**BOOK, "title": "Parable of the Talents"}]
+
+    async def scenario(session):
+        await session.exec(text(REJECT_TRIGGER))
+        await session.commit()
+        result = await BookService().bulk_create_books(session, items)
+        titles = (await session.exec(text("SELECT title FROM books ORDER BY title"))).scalars().all()
+        return result, titles
+
+    result, titles = run_db(scenario)
+
+    assert [book.title for book in result.items] == ["Parable of the Sower", "Parable of the Talents"]
+    assert [error.index for error in result.errors] == [1, 2]
+    assert "rejected by constraint" in result.errors[0].detail
+    assert isinstance(result.errors[1].detail, list)
+    assert titles == ["Parable of the Sower", "Parable of the Talents"]
+
+
+def test_bulk_create_inserts_everything_in_one_statement_when_nothing_fails(run_db):
+    async def scenario(session):
+        result = await BookService().bulk_create_books(session, [BOOK] * 3)
+        count = (await session.exec(text("SELECT count(*) FROM books"))).scalar_one()
+        return result, count
+
+    result, count = run_db(scenario)
+
+    assert len(result.items) == 3 and not result.errors
+    assert len({book.uid for book in result.items}) == 3
+    assert count == 3
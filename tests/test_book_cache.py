@@ -0,0 +1,84 @@
+import asyncio
+import time
+import uuid
+
+from src.books.cache import BOOK_KEY, LOCK_SUFFIX, BookCache
+
+
+def test_concurrent_misses_share_one_load(fake_redis):
+    cache = BookCache(ttl=60)
+    book_id = uuid.uuid4()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return b'{"v":1}'
+
+    async def scenario():
+        payloads = await asyncio.gather(*(cache.get_or_load(book_id, loader) for _ in range(10)))
+        return payloads, await cache.peek(book_id)
+
+    payloads, cached = asyncio.run(scenario())
+
+    assert payloads == [b'{"v":1}'] * 10
+    assert len(loads) == 1
+    assert cached == b'{"v":1}'
+
+
+def test_load_that_raced_an_invalidation_is_not_cached(fake_redis):
+    cache = BookCache(ttl=60)
+    book_id = uuid.uuid4()
+    version = [1]
+
+    async def scenario():
+        started, written = asyncio.Event(), asyncio.Event()
+
+        async def stale_loader():
+            payload = f'{{"v":{version[0]}}}'.encode()
+            started.set()
+            await written.wait()
+            return payload
+
+        async def fresh_loader():
+            return f'{{"v":{version[0]}}}'.encode()
+
+        load = asyncio.create_task(cache.get_or_load(book_id, stale_loader))
+        await started.wait()
+        version[0] = 2
+        await cache.invalidate(book_id)
+        written.set()
+        stale = await load
+
+        return stale, await cache.peek(book_id), await cache.get_or_load(book_id, fresh_loader)
+
+    stale, cached, fresh = asyncio.run(scenario())
+
+    # The request that started before the write still gets what it read, but nobody after it does
+    assert stale == b'{"v":1}'
+    assert cached is None
+    assert fresh == b'{"v":2}'
+
+
+def test_waiter_loads_itself_once_the_lock_is_released_without_a_fill(fake_redis):
+    cache = BookCache(ttl=60)
+    book_id = uuid.uuid4()
+    lock_key = BOOK_KEY.format(book_id) + LOCK_SUFFIX
+
+    async def loader():
+        return b'{"v":1}'
+
+    async def scenario():
+        # Another worker holds the lock, then fails its load
+        await fake_redis.set(lock_key, b"1", px=5000)
+        waiter = asyncio.create_task(cache.get_or_load(book_id, loader))
+        await asyncio.sleep(0.1)
+        await fake_redis.delete(lock_key)
+        started = time.monotonic()
+        payload = await waiter
+        return payload, time.monotonic() - started
+
+    payload, waited = asyncio.run(scenario())
+
+    assert payload == b'{"v":1}'
+    assert waited < 1
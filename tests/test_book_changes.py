@@ -0,0 +1,98 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.books.models import Book, BookTombstone
+from src.books.service import BookService
+from src.config import Config
+from src.db.pagination import decode_cursor, encode_cursor
+
+RETENTION = timedelta(days=Config.BOOK_TOMBSTONE_RETENTION_DAYS)
+
+
+def book(updated_at):
+    return Book(
+        uid=uuid.uuid4(),
+        title="Dune",
+        author="Frank Herbert",
+        publisher="Chilton",
+        published_date=date(1965, 8, 1),
+        page_count=412,
+        language="en",
+        created_at=updated_at,
+        updated_at=updated_at,
+    )
+
+
+def started_at(cursor):
+    return decode_cursor(cursor, str, str, lambda value: value)[2]
+
+
+def test_initial_sync_pages_across_rows_older_than_retention(run_db):
+    old = datetime.utcnow() - RETENTION * 10
+    books = [book(old + timedelta(minutes=minute)) for minute in range(5)]
+
+    async def sync(session):
+        session.add_all(books)
+        await session.commit()
+        pages = [await BookService().get_changes(session, limit=2)]
+        while pages[-1].has_more:
+            pages.append(await BookService().get_changes(session, since=pages[-1].next_cursor, limit=2))
+        return pages
+
+    pages = run_db(sync)
+
+    assert [item["uid"] for page in pages for item in page.items] == [b.uid for b in books]
+    assert all(item["change"] == "upsert" and item["book"]["title"] == "Dune" for page in pages for item in page.items)
+    assert [page.has_more for page in pages] == [True, True, False]
+    # Until it catches up the cursor carries the sync's start; after that it is a delta cursor
+    assert datetime.fromisoformat(started_at(pages[0].next_cursor)) > old
+    assert started_at(pages[-1].next_cursor) is None
+
+
+def test_initial_sync_only_sends_tombstones_of_books_deleted_since_it_started(run_db):
+    now = datetime.utcnow()
+    started = now - timedelta(hours=1)
+    old = book(now - RETENTION * 10)
+    deleted_before = BookTombstone(uid=uuid.uuid4(), deleted_at=now - timedelta(hours=2))
+    deleted_since = BookTombstone(uid=uuid.uuid4(), deleted_at=now - timedelta(minutes=30))
+
+    async def resume(session):
+        session.add_all([old, deleted_before, deleted_since])
+        await session.commit()
+        cursor = encode_cursor(old.updated_at - timedelta(seconds=1), uuid.UUID(int=0), started)
+        return await BookService().get_changes(session, since=cursor)
+
+    page = run_db(resume)
+
+    assert [(item["uid"], item["change"]) for item in page.items] == [(old.uid, "upsert"), (deleted_since.uid, "delete")]
+    assert page.items[1]["book"] is None
+
+
+def test_delta_cursor_sends_every_later_tombstone(run_db):
+    now = datetime.utcnow()
+    deleted = BookTombstone(uid=uuid.uuid4(), deleted_at=now - timedelta(hours=2))
+
+    async def delta(session):
+        session.add(deleted)
+        await session.commit()
+        cursor = encode_cursor(now - timedelta(days=1), uuid.UUID(int=0), None)
+        return await BookService().get_changes(session, since=cursor)
+
+    page = run_db(delta)
+
+    assert [(item["uid"], item["change"]) for item in page.items] == [(deleted.uid, "delete")]
+    assert not page.has_more
+
+
+@pytest.mark.parametrize("initial_sync", [False, True])
+def test_cursor_older_than_retention_is_gone(run_db, initial_sync):
+    old = datetime.utcnow() - RETENTION - timedelta(days=1)
+    cursor = encode_cursor(old, uuid.uuid4(), old if initial_sync else None)
+
+    with pytest.raises(HTTPException) as exc:
+        run_db(lambda session: BookService().get_changes(session, since=cursor))
+
+    assert exc.value.status_code == 410
@@ -0,0 +1,46 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from src.books.schemas import BookFilter
+from src.books.service import BookService
+from src.db.pagination import encode_cursor
+
+
+@pytest.mark.parametrize(
+    ("sort", "value"),
+    [
+        ("page_count", "abc"),
+        ("created_at", 5),
+        ("published_date", "not-a-date"),
+    ],
+)
+def test_tampered_cursor_value_is_rejected(sort, value):
+    cursor = encode_cursor(sort, "desc", value, str(uuid.uuid4()))
+
+    with pytest.raises(HTTPException) as exc:
+        BookService().build_list_statement(["title"], 10, cursor, BookFilter(sort=sort))
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid pagination cursor"
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor("title", "desc", "Dune", str(uuid.uuid4()))
+
+    with pytest.raises(HTTPException) as exc:
+        BookService().build_list_statement(["title"], 10, cursor, BookFilter(sort="page_count"))
+
+    assert exc.value.status_code == 400
+
+
+def test_valid_cursor_builds_keyset_condition():
+    uid = uuid.uuid4()
+    cursor = encode_cursor("page_count", "asc", 300, str(uid))
+
+    statement = BookService().build_list_statement(
+        ["title"], 10, cursor, BookFilter(sort="page_count", order="asc")
+    )
+
+    assert "(books.page_count, books.uid) >" in str(statement)
@@ -0,0 +1,149 @@
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from src.books import routes
+from src.books.etag import ReadPreconditions, book_etag, if_match, list_etag, parse_etag
+from src.books.models import Book
+from src.books.schemas import BookFilter, BookUpdate
+from src.books.service import BookService
+from src.config import Config
+
+
+def book(updated_at):
+    return Book(
+        uid=uuid.uuid4(),
+        title="The Dispossessed",
+        author="Ursula K. Le Guin",
+        publisher="Harper & Row",
+        published_date=date(1974, 5, 1),
+        page_count=341,
+        language="en",
+        created_at=updated_at,
+        updated_at=updated_at,
+    )
+
+
+def list_books(session, if_none_match=None, if_modified_since=None):
+    return routes.get_all_books(
+        limit=50,
+        cursor=None,
+        fields=None,
+        filters=BookFilter(),
+        preconditions=ReadPreconditions(if_none_match, if_modified_since),
+        session=session,
+        _=True,
+    )
+
+
+def test_listing_always_sends_an_etag_that_revalidates_until_a_delete(run_db):
+    now = datetime.utcnow()
+    books = [book(now - timedelta(days=1)), book(now)]
+
+    async def scenario(session):
+        session.add_all(books)
+        await session.commit()
+        first = await list_books(session)
+        unchanged = await list_books(session, if_none_match=first.headers["ETag"])
+
+        # The latest updated_at stays put, so only the count in the ETag notices the delete
+        await session.delete(books[0])
+        await session.commit()
+        after_delete = await list_books(session, if_none_match=first.headers["ETag"])
+        by_date = await list_books(session, if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT")
+        return first, unchanged, after_delete, by_date
+
+    first, unchanged, after_delete, by_date = run_db(scenario)
+
+    assert first.status_code == 200 and first.headers["ETag"]
+    assert "Last-Modified" not in first.headers
+    assert unchanged.status_code == 304 and unchanged.headers["ETag"] == first.headers["ETag"]
+    assert after_delete.status_code == 200 and after_delete.headers["ETag"] != first.headers["ETag"]
+    # If-Modified-Since can't see deletes, so listings don't honour it
+    assert by_date.status_code == 200
+
+
+def test_book_etag_round_trips_to_the_microsecond():
+    updated_at = datetime(2024, 2, 29, 12, 30, 15, 123456)
+
+    assert parse_etag(book_etag(updated_at)) == updated_at
+    assert list_etag(updated_at, 2) != list_etag(updated_at, 3)
+    assert list_etag(None, 0) == '"0-0"'
+
+
+@pytest.mark.parametrize("etag", ['"zz"', '""', "abc", 'W/"1f"'])
+def test_parse_etag_rejects_malformed_tags(etag):
+    assert parse_etag(etag) is None
+
+
+def test_if_match_accepts_any_version_when_absent_or_star(monkeypatch):
+    monkeypatch.setattr(Config, "BOOK_REQUIRE_IF_MATCH", False)
+
+    assert if_match(None) is None
+    assert if_match('"1f", *') is None
+
+
+def test_if_match_can_be_required(monkeypatch):
+    monkeypatch.setattr(Config, "BOOK_REQUIRE_IF_MATCH", True)
+
+    with pytest.raises(HTTPException) as exc:
+        if_match(None)
+
+    assert exc.value.status_code == 428
+
+
+def test_if_match_drops_weak_and_malformed_tags():
+    updated_at = datetime(2024, 1, 1)
+
+    assert if_match(f'W/{book_etag(updated_at)}, nonsense, {book_etag(updated_at)}') == [updated_at]
+    # Nothing left to match: the write must fail its precondition rather than go through
+    assert if_match('W/"1f"') == []
+
+
+def test_if_none_match_compares_weakly_and_overrides_if_modified_since():
+    etag = '"1f"'
+    future = "Fri, 01 Jan 2100 00:00:00 GMT"
+
+    assert ReadPreconditions(f'"0", W/{etag}', None).not_modified(etag, None)
+    assert ReadPreconditions("*", None).not_modified(etag, None)
+    assert not ReadPreconditions('"0"', future).not_modified(etag, datetime(2024, 1, 1))
+
+
+def test_if_modified_since_has_second_precision():
+    updated_at = datetime(2024, 1, 1, 12, 0, 0, 999999)
+
+    assert ReadPreconditions(None, "Mon, 01 Jan 2024 12:00:00 GMT").not_modified('"1"', updated_at)
+    assert not ReadPreconditions(None, "Mon, 01 Jan 2024 11:59:59 GMT").not_modified('"1"', updated_at)
+    assert not ReadPreconditions(None, "not a date").not_modified('"1"', updated_at)
+
+
+@pytest.fixture
+def quiet_writes(monkeypatch, fake_redis):
+    # NOTIFY is Postgres-only; its SQL is covered in test_book_events
+    monkeypatch.setattr(Config, "BOOK_EVENTS_ENABLED", False)
+
+
+def test_update_with_stale_if_match_fails_its_precondition(run_db, quiet_writes):
+    stored = book(datetime.utcnow() - timedelta(days=1))
+    uid, version = stored.uid, stored.updated_at
+    patch = BookUpdate(page_count=400)
+
+    async def scenario(session):
+        session.add(stored)
+        await session.commit()
+        service = BookService()
+        with pytest.raises(HTTPException) as stale:
+            await service.update_book(session, uid, patch, expected=[version - timedelta(seconds=1)])
+        with pytest.raises(HTTPException) as missing:
+            await service.update_book(session, uuid.uuid4(), patch, expected=[version])
+        await session.rollback()
+        updated = await service.update_book(session, uid, patch, expected=[version])
+        return stale.value, missing.value, updated.page_count
+
+    stale, missing, page_count = run_db(scenario)
+
+    assert stale.status_code == 412
+    assert missing.status_code == 404
+    assert page_count == 400
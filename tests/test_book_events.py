@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from src.books.events import EVICTED, RESET, BookEvent, BookEventHub, EventStreamResponse, notify_book_changes, upsert_change
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def exec(self, statement):
+        self.statements.append(statement.compile(dialect=asyncpg_dialect()))
+
+
+def test_notify_names_the_unnested_payload_column():
+    session = RecordingSession()
+    book = {"uid": uuid.uuid4(), "updated_at": datetime(2024, 1, 1), "language": "en", "author": "Ursula K. Le Guin"}
+
+    asyncio.run(notify_book_changes(session, [upsert_change(book)]))
+
+    [statement] = session.statements
+    sql = " ".join(str(statement).split())
+    # Without the column list, Postgres names unnest's output after the alias and anon_1.payload doesn't exist
+    assert "FROM unnest($2::TEXT[]) AS anon_1(payload)" in sql
+    assert "pg_notify($1::VARCHAR, anon_1.payload)" in sql
+    assert len(statement.params["payloads"]) == 1
+
+
+def running_hub(queue_size=4, max_subscribers=10):
+    hub = BookEventHub("postgresql://unused", queue_size=queue_size, max_subscribers=max_subscribers)
+    # Stands in for the LISTEN task, which subscribe() requires to be running
+    hub._task = object()
+    return hub
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_publish_reaches_subscribers_whose_filter_matches():
+    hub = running_hub()
+    exact, by_language, by_author, everything = (
+        hub.subscribe("en", "Ursula K. Le Guin"),
+        hub.subscribe("en", None),
+        hub.subscribe(None, "Ursula K. Le Guin"),
+        hub.subscribe(),
+    )
+    other_language, other_author = hub.subscribe("fr", None), hub.subscribe(None, "Octavia E. Butler")
+    event = BookEvent("book", b"{}")
+
+    hub.publish(event, "en", "Ursula K. Le Guin")
+
+    for subscription in (exact, by_language, by_author, everything):
+        assert drain(subscription) == [event]
+    assert drain(other_language) == drain(other_author) == []
+
+
+def test_full_subscriber_is_evicted_with_a_closing_event():
+    hub = running_hub(queue_size=2)
+    slow, fast = hub.subscribe(), hub.subscribe()
+    events = [BookEvent("book", str(n).encode()) for n in range(3)]
+
+    for event in events[:2]:
+        hub.publish(event, "en", "Ursula K. Le Guin")
+    drain(fast)
+    hub.publish(events[2], "en", "Ursula K. Le Guin")
+
+    # The backlog is dropped so the client learns it was evicted straight away
+    assert drain(slow) == [EVICTED]
+    assert drain(fast) == [events[2]]
+    assert hub._count == 1
+    hub.publish(events[0], "en", "Ursula K. Le Guin")
+    assert drain(slow) == []
+
+
+def test_broadcast_reaches_every_subscriber_and_removal_is_idempotent():
+    hub = running_hub()
+    subscriptions = [hub.subscribe("en", None), hub.subscribe(None, "Octavia E. Butler")]
+
+    hub.broadcast(RESET)
+    subscriptions[0].close()
+    subscriptions[0].close()
+
+    assert [drain(subscription) for subscription in subscriptions] == [[RESET], [RESET]]
+    assert hub._count == 1 and list(hub._subscribers) == [(None, "Octavia E. Butler")]
+
+
+def test_subscribe_is_refused_when_full_or_not_listening():
+    hub = running_hub(max_subscribers=1)
+    hub.subscribe()
+
+    with pytest.raises(HTTPException) as full:
+        hub.subscribe()
+    with pytest.raises(HTTPException) as stopped:
+        BookEventHub("postgresql://unused", queue_size=4, max_subscribers=10).subscribe()
+
+    assert full.value.status_code == stopped.value.status_code == 503
+
+
+def test_event_stream_releases_its_subscription_when_the_client_left_before_the_first_chunk():
+    hub = running_hub()
+    scope = {"type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "method": "GET", "path": "/", "headers": []}
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        await asyncio.sleep(0)
+
+    async def scenario():
+        response = EventStreamResponse(hub.subscribe(), keepalive=60)
+        assert hub._count == 1
+        await response(scope, receive, send)
+
+    asyncio.run(scenario())
+
+    assert hub._count == 0
@@ -0,0 +1,89 @@
+import asyncio
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from src.books.ingest import DEAD_LETTER_KEY, STREAM_KEY, IngestQueue, read_ingest_rows
+
+BOOK = {
+    "title": "Kindred",
+    "author": "Octavia E. Butler",
+    "publisher": "Doubleday",
+    "published_date": "1979-06-01",
+    "page_count": 264,
+    "language": "en",
+}
+
+
+class StreamedRequest:
+    def __init__(self, content_type, *chunks):
+        self.headers = {"content-type": content_type}
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def read(request, max_rows=10, max_bytes=1000):
+    return asyncio.run(read_ingest_rows(request, max_rows, max_bytes))
+
+
+def test_reads_json_arrays_and_ndjson():
+    assert read(StreamedRequest("application/json", b'[{"a":', b"1}]")) == [{"a": 1}]
+    assert read(StreamedRequest("application/x-ndjson", b'{"a":1}\n{"a"', b":2}")) == [{"a": 1}, {"a": 2}]
+
+
+@pytest.mark.parametrize(
+    ("request_", "detail"),
+    [
+        # Cut off mid-line at the row limit: too large, not malformed
+        (StreamedRequest("application/x-ndjson", b'{"a":1}\n{"a":2}\n{"a":3}\n{"a"'), "At most 2 books per ingest job"),
+        (StreamedRequest("application/json", b"[" + b"1," * 300, b"1]"), "Ingest bodies are limited to 500 bytes"),
+        (StreamedRequest("application/x-ndjson", b"1\n" * 300), "Ingest bodies are limited to 500 bytes"),
+    ],
+)
+def test_oversized_bodies_are_rejected_with_413(request_, detail):
+    with pytest.raises(HTTPException) as exc:
+        read(request_, max_rows=2, max_bytes=500)
+
+    assert exc.value.status_code == 413
+    assert exc.value.detail == detail
+
+
+def test_submit_queues_valid_rows_and_dead_letters_the_rest(fake_redis):
+    queue = IngestQueue(chunk_rows=2, job_ttl=60)
+    rows = [BOOK, {**BOOK, "page_count": "many"}, BOOK, BOOK]
+
+    async def scenario():
+        job = await queue.submit(rows)
+        return job, await fake_redis.xrange(STREAM_KEY), await fake_redis.xrange(DEAD_LETTER_KEY), await queue.get_errors(job.job_id)
+
+    job, entries, dead, errors = asyncio.run(scenario())
+
+    assert (job.status, job.total, job.failed, job.processed) == ("queued", 4, 1, 1)
+    assert [[index for index, _ in orjson.loads(fields[b"rows"])] for _, fields in entries] == [[0, 2], [3]]
+    assert [fields[b"index"] for _, fields in dead] == [b"1"]
+    assert [error.index for error in errors] == [1]
+
+
+def test_submit_yields_to_other_requests_while_validating(fake_redis):
+    queue = IngestQueue(chunk_rows=100, job_ttl=60)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def scenario():
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        ticks.clear()
+        await queue.submit([BOOK] * 1000)
+        task.cancel()
+
+    asyncio.run(scenario())
+
+    assert len(ticks) >= 9
@@ -0,0 +1,145 @@
+"""
+Compile checks for the statements only Postgres can run; the SQLite tests in the
+other modules execute the rest.
+"""
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+
+from src.books.schemas import BookBulkUpdate, BookFilter
+from src.books.service import BookService
+from src.config import Config
+
+
+class RecordingResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self.rows[0]
+
+    def one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+    def scalars(self):
+        return self
+
+
+class RecordingSession:
+    """Compiles every statement for asyncpg and answers each with `rows`."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def exec(self, statement, params=None):
+        compiled = statement.compile(dialect=asyncpg_dialect())
+        self.statements.append((" ".join(str(compiled).split()), compiled.params, params))
+        return RecordingResult(self.rows)
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_book_events(monkeypatch):
+    monkeypatch.setattr(Config, "BOOK_EVENTS_ENABLED", False)
+
+
+def deleted_row():
+    return SimpleNamespace(uid=uuid.uuid4(), author="Ursula K. Le Guin", language="en")
+
+
+def test_bulk_update_joins_a_typed_values_list():
+    session = RecordingSession()
+    uid = uuid.uuid4()
+
+    asyncio.run(BookService()._update_books(session, [BookBulkUpdate(uid=uid, page_count=400)]))
+
+    [(sql, params, _)] = session.statements
+    assert "FROM (VALUES ($2::UUID, NULL, NULL, NULL, NULL, $3::INTEGER, NULL)) AS patch (uid, title, author" in sql
+    assert "WHERE books.uid = patch.uid" in sql
+    # The casts type columns that are NULL in every row, which Postgres would otherwise take for text
+    assert "page_count=coalesce(CAST(patch.page_count AS INTEGER), books.page_count)" in sql
+    assert "published_date=coalesce(CAST(patch.published_date AS DATE), books.published_date)" in sql
+    assert sql.endswith("RETURNING books.uid, books.title, books.author, books.publisher, books.published_date, "
+                        "books.page_count, books.language, books.created_at, books.updated_at")
+    assert uid in params.values() and 400 in params.values()
+
+
+def test_delete_leaves_a_tombstone_in_the_same_statement(fake_redis):
+    session = RecordingSession([deleted_row()])
+    version = datetime(2024, 1, 1)
+
+    asyncio.run(BookService().delete_book(session, uuid.uuid4(), expected=[version]))
+
+    (delete_sql, params, _), (purge_sql, _, _) = session.statements
+    assert delete_sql.startswith(
+        "WITH deleted AS (DELETE FROM books WHERE books.uid = $2::UUID AND books.updated_at IN"
+    )
+    assert "RETURNING books.uid, books.author, books.language), tombstones AS (INSERT INTO book_tombstones (uid, deleted_at) " \
+           "SELECT deleted.uid AS uid, $1::TIMESTAMP WITHOUT TIME ZONE AS anon_1 FROM deleted " \
+           "ON CONFLICT (uid) DO UPDATE SET deleted_at = excluded.deleted_at)" in delete_sql
+    assert delete_sql.endswith("SELECT deleted.uid, deleted.author, deleted.language FROM deleted")
+    assert [version] in params.values()
+    assert purge_sql.startswith("DELETE FROM book_tombstones WHERE book_tombstones.deleted_at <")
+
+
+def test_bulk_delete_binds_the_uids_as_one_array(fake_redis):
+    rows = [deleted_row()]
+    missing = uuid.uuid4()
+    session = RecordingSession(rows)
+
+    result = asyncio.run(BookService().bulk_delete_books(session, [rows[0].uid, missing, rows[0].uid]))
+
+    sql, _, params = session.statements[0]
+    assert "DELETE FROM books WHERE books.uid = ANY ($2::UUID[]) RETURNING" in sql
+    assert "tombstones AS (INSERT INTO book_tombstones" in sql
+    assert sorted(params["uids"]) == sorted({rows[0].uid, missing})
+    assert result.deleted == [rows[0].uid]
+    assert [error.index for error in result.errors] == [1]
+
+
+def test_ingest_insert_skips_uids_already_present():
+    rows = [{"uid": uuid.uuid4()}, {"uid": uuid.uuid4()}]
+    session = RecordingSession([rows[0]["uid"]])
+
+    inserted = asyncio.run(BookService().insert_ingested_books(session, rows))
+
+    [(sql, _, params)] = session.statements
+    assert sql.startswith("INSERT INTO books (uid, title, author, publisher, published_date, page_count, language,")
+    assert sql.endswith("ON CONFLICT (uid) DO NOTHING RETURNING books.uid")
+    assert params == rows
+    assert inserted == {rows[0]["uid"]}
+
+
+def test_search_ranks_full_text_and_trigram_matches():
+    session = RecordingSession()
+
+    asyncio.run(BookService().search_books(session, "dispossesed", cursor=None))
+
+    [(sql, params, _)] = session.statements
+    assert "ts_rank_cd(books.search_vector, websearch_to_tsquery($1::REGCONFIG, $2::VARCHAR)) + " \
+           "greatest(similarity(books.title, $3::VARCHAR), similarity(books.author, $4::VARCHAR)) AS rank" in sql
+    assert "WHERE (books.search_vector @@ websearch_to_tsquery($1::REGCONFIG, $2::VARCHAR)) " \
+           "OR (books.title % $5::VARCHAR) OR (books.author % $6::VARCHAR)" in sql
+    assert sql.endswith("ORDER BY rank DESC, books.uid DESC LIMIT $7::INTEGER")
+    assert 21 in params.values()
+
+
+def test_list_version_aggregates_only_the_filtered_set():
+    session = RecordingSession([(None, 0)])
+
+    version = asyncio.run(BookService().get_list_version(session, BookFilter(language="en")))
+
+    [(sql, params, _)] = session.statements
+    assert sql == "SELECT max(books.updated_at) AS max_1, count(*) AS count_1 FROM books WHERE books.language = $1::VARCHAR"
+    assert list(params.values()) == ["en"]
+    assert version == (None, 0)
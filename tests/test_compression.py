@@ -0,0 +1,92 @@
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from src import compression
+from src.compression import CompressionMiddleware, CpuBudget, negotiate
+
+
+def client(minimum_size=1024):
+    app = FastAPI()
+
+    @app.get("/large")
+    def large():
+        return Response(b'{"title":"' + b"x" * 5000 + b'"}', media_type="application/json", headers={"ETag": '"1f"'})
+
+    @app.get("/small")
+    def small():
+        return Response(b"{}", media_type="application/json", headers={"ETag": '"1f"'})
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 2000, media_type="image/png")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+    return TestClient(app)
+
+
+def test_compressed_response_gets_a_weak_etag_and_vary():
+    response = client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] == 'W/"1f"'
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.json()["title"] == "x" * 5000
+
+
+@pytest.mark.parametrize(
+    ("path", "accept_encoding"),
+    [
+        ("/small", "gzip"),  # below the minimum size
+        ("/large", "identity"),  # nothing the client accepts
+    ],
+)
+def test_uncompressed_compressible_response_still_varies(path, accept_encoding):
+    response = client().get(path, headers={"Accept-Encoding": accept_encoding})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"1f"'
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_incompressible_type_is_left_alone():
+    response = client().get("/image", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, br", "br"),  # equal weights: the server's order decides
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("BR;q=0.8, gzip;q=0.3", "br"),
+        ("*", "zstd"),
+        ("*;q=0.5, gzip", "gzip"),
+        ("*, zstd;q=0, br;q=0", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("gzip;q=high, br;q=0.1", "br"),  # a malformed entry is ignored
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    assert negotiate(accept_encoding, ["zstd", "br", "gzip"]) == expected
+
+
+def test_cpu_budget_is_refilled_each_window(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(compression.time, "monotonic", lambda: now[0])
+    budget = CpuBudget(fraction=0.25, window=2.0)
+
+    assert budget.available()
+    budget.spend(0.3)
+    assert budget.available()
+    budget.spend(0.2)
+    assert not budget.available()
+
+    now[0] += 1.9
+    assert not budget.available()
+    now[0] += 0.1
+    assert budget.available()
@@ -0,0 +1,51 @@
+import asyncio
+
+from src.instrumentation import InstrumentationMiddleware
+
+
+async def slow_app(scope, receive, send):
+    await asyncio.sleep(0.05)
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def request(middleware, headers=()):
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(k.encode(), v.encode()) for k, v in headers]}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        await middleware(scope, receive, send)
+        return messages[0]["status"], b"".join(m.get("body", b"") for m in messages[1:])
+
+    return run()
+
+
+def test_concurrent_requested_profiles_get_a_conflict_instead_of_a_500():
+    middleware = InstrumentationMiddleware(slow_app, profile_token="secret")
+    headers = [("x-profile", "cprofile"), ("x-profile-token", "secret")]
+
+    async def scenario():
+        return await asyncio.gather(request(middleware, headers), request(middleware, headers))
+
+    (first, report), (second, _) = asyncio.run(scenario())
+
+    assert first == 200 and b"function calls" in report
+    assert second == 409
+
+
+def test_sampling_skips_requests_while_another_is_profiled(tmp_path):
+    middleware = InstrumentationMiddleware(slow_app, sample_rate=1.0, profile_dir=str(tmp_path))
+
+    async def scenario():
+        return await asyncio.gather(*(request(middleware) for _ in range(3)))
+
+    responses = asyncio.run(scenario())
+
+    assert responses == [(200, b"ok")] * 3
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Request
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.auth import rate_limit
+from src.auth.rate_limit import RateLimiter
+from src.config import Config
+
+
+def request(ip="203.0.113.7", forwarded_for=None):
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "method": "POST", "path": "/login", "headers": headers, "client": (ip, 50000)})
+
+
+def attempts(limiter, requests):
+    """Status of each `(request, email)` attempt: None when let through, else the rejection."""
+    async def run():
+        results = []
+        for req, email in requests:
+            try:
+                await limiter.check(req, email=email)
+                results.append(None)
+            except HTTPException as exc:
+                results.append(exc)
+        return results
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(Config, "RATE_LIMIT_ENABLED", True)
+
+
+def test_burst_is_allowed_then_rejected_with_retry_after(fake_redis):
+    limiter = RateLimiter("login", {"ip": (3, 6)})
+
+    results = attempts(limiter, [(request(), None)] * 4)
+
+    assert results[:3] == [None] * 3
+    assert results[3].status_code == 429
+    # One token every ten seconds at six a minute
+    assert 1 <= int(results[3].headers["Retry-After"]) <= 10
+
+
+def test_buckets_are_per_ip_and_per_email(fake_redis):
+    limiter = RateLimiter("login", {"ip": (10, 60), "email": (2, 1)})
+
+    results = attempts(limiter, [
+        (request("203.0.113.1"), "reader@example.com"),
+        (request("203.0.113.2"), " Reader@Example.com"),
+        # Same email from a third address: its bucket is empty whatever the IP
+        (request("203.0.113.3"), "reader@example.com"),
+        (request("203.0.113.3"), "other@example.com"),
+    ])
+
+    assert [result and result.status_code for result in results] == [None, None, 429, None]
+
+
+def test_rejected_client_is_turned_away_locally_without_redis(fake_redis, monkeypatch):
+    limiter = RateLimiter("login", {"ip": (1, 1)})
+    attempts(limiter, [(request(), None)] * 2)
+
+    async def unreachable(buckets):
+        raise AssertionError("Redis should not be asked")
+
+    monkeypatch.setattr(rate_limit, "take_tokens", unreachable)
+    [result] = attempts(limiter, [(request(), None)])
+
+    assert result.status_code == 429
+    # Another client is not affected by the deny cache
+    monkeypatch.setattr(rate_limit, "take_tokens", lambda buckets: asyncio.sleep(0, (True, [0.0])))
+    assert attempts(limiter, [(request("198.51.100.1"), None)]) == [None]
+
+
+def test_requests_go_through_when_redis_is_down(monkeypatch):
+    async def down(buckets):
+        raise RedisConnectionError("connection refused")
+
+    monkeypatch.setattr(rate_limit, "take_tokens", down)
+    limiter = RateLimiter("login", {"ip": (1, 1)})
+
+    assert attempts(limiter, [(request(), None)] * 3) == [None] * 3
+
+
+def test_forwarded_address_is_only_used_when_trusted(fake_redis):
+    trusting = RateLimiter("login", {"ip": (1, 1)}, trust_forwarded=True)
+    untrusting = RateLimiter("signup", {"ip": (1, 1)})
+    proxied = [(request(forwarded_for="198.51.100.1, 10.0.0.1"), None), (request(forwarded_for="198.51.100.2"), None)]
+
+    # Behind a trusted proxy each forwarded client has its own bucket; otherwise they share the proxy's
+    assert attempts(trusting, proxied) == [None, None]
+    assert [result and result.status_code for result in attempts(untrusting, proxied)] == [None, 429]